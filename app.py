@@ -1,9 +1,13 @@
+import os
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 import numpy as np
+import instrumentation
+from calibration import CALIBRATION_PATH
 from data_loader import get_current_fixtures
-from predictor import MatchPredictor
+from logo_cache import logo_src
+from model_registry import get_predictor, load_artifact, preload_predictor
+from predictor import METRICS_PATH
+from scenarios import FORM_LEVELS, scenario_grid
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -41,26 +45,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-import base64
-
-# --- Helper Function: Image handling ---
-def get_img_as_base64(file_path):
-    """
-    Reads an image file (local) and returns a base64 string for HTML embedding.
-    If it's a URL (http/https), returns it as is.
-    """
-    if file_path.startswith("http") or file_path.startswith("https"):
-        return file_path
-    
-    try:
-        with open(file_path, "rb") as f:
-            data = f.read()
-            encoded = base64.b64encode(data).decode()
-        return f"data:image/png;base64,{encoded}"
-    except Exception as e:
-        # Fallback if file not found
-        return "https://via.placeholder.com/100?text=Logo"
-
 # --- Helper Function: Injury Card ---
 def render_injury_card(team_name, injuries, color_code):
     injuries_html = "".join([f"<li>{inj}</li>" for inj in injuries]) if injuries else "<li>No major injuries</li>"
@@ -89,7 +73,14 @@ st.markdown("### 🚀 Professional Match Forecasting Engine")
 st.markdown("---")
 
 # --- Initialize Logic ---
-predictor = MatchPredictor()
+# Opt-in metrics / profiling (see instrumentation.py); no-ops unless enabled via environment
+instrumentation.start()
+rerun_profile = instrumentation.profile('app_rerun')
+rerun_profile.start()
+
+# Artifacts are loaded once per process and shared across reruns and sessions.
+# On a cold start the model loads in a background thread while the fixtures and briefing render.
+predictor_loading = preload_predictor()
 fixtures = get_current_fixtures()
 
 # --- Sidebar ---
@@ -97,13 +88,12 @@ fixtures = get_current_fixtures()
 st.sidebar.header("📅 Matchweek Fixtures")
 selected_match_id = st.sidebar.radio(
     "Select a Match for Deep Dive:",
-    [f"{f['home_team']} vs {f['away_team']}" for f in fixtures],
+    fixtures.labels,
     index=0
 )
 
-# Helper to find selected match data (Moved Up)
-match_index = [f"{f['home_team']} vs {f['away_team']}" for f in fixtures].index(selected_match_id)
-selected_match = fixtures[match_index]
+# Helper to find selected match data (Moved Up): label index lookup, a view of the store row
+selected_match = fixtures.by_label(selected_match_id)
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 🛠️ Match Simulation")
@@ -118,55 +108,32 @@ with st.sidebar.expander("What-If Analysis", expanded=False):
     st.write("Injury Impact:")
     sim_injury = st.checkbox(f"Key Player Missing for {selected_match['home_team']}?", value=False, help="Simulate the impact of a star player being injured (e.g., reduced attack/defense strength).")
     
-    # Calculate Data Overrides
-    # Base Odds
-    base_odds_h = selected_match.get('avg_odds_home', 2.5)
-    base_odds_a = selected_match.get('avg_odds_away', 2.5)
-    
-    # Logic: Better form -> Lower odds (Stronger)
-    # 3 is neutral. Each point +/- adjusts odds by 10%
-    form_factor_h = (3 - sim_home_form) * 0.1  # e.g. Form 5 -> -0.2 (20% drop in odds -> Stronger)
-    form_factor_a = (3 - sim_away_form) * 0.1
-    
-    # Injury Factor: Injury -> Higher odds (Weaker) e.g. +15%
-    injury_factor = 0.15 if sim_injury else 0.0
-    
-    # Apply modifiers
-    sim_odds_h = base_odds_h * (1 + form_factor_h + injury_factor)
-    sim_odds_a = base_odds_a * (1 + form_factor_a) # Assuming injury check is for Home only as per prompt
-    
-    # Simulated Form Strings for Explanation Engine
-    # If slider is 5, give them 5 Wins. If 1, give them 5 Losses.
-    def get_sim_form_str(level):
-        if level == 5: return ["W", "W", "W", "W", "W"]
-        if level == 4: return ["W", "W", "D", "W", "D"]
-        if level == 3: return ["W", "L", "D", "W", "L"]
-        if level == 2: return ["L", "L", "D", "L", "D"]
-        return ["L", "L", "L", "L", "L"]
-
-    # Apply Simulation to Match Data Copy
-    simulated_match = selected_match.copy()
-    simulated_match['avg_odds_home'] = sim_odds_h
-    simulated_match['avg_odds_away'] = sim_odds_a
-    simulated_match['last_5_matches_home'] = get_sim_form_str(sim_home_form)
-    simulated_match['last_5_matches_away'] = get_sim_form_str(sim_away_form)
-    
     # Visual Feedback
     if sim_home_form != 3 or sim_away_form != 3 or sim_injury:
         st.sidebar.warning("⚠️ Simulation Active! Predictions modified.")
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 🤖 Model Stats")
-st.sidebar.metric("Model Accuracy", "54.1%", delta="vs Random (33%)")
-st.sidebar.info("Trained on seasons 23-25 with live odds integration.")
-
-# Helper to find selected match data
-match_index = [f"{f['home_team']} vs {f['away_team']}" for f in fixtures].index(selected_match_id)
-selected_match = fixtures[match_index]
-
-
-# Update selected_match if radio changes (though typically logic runs top-down)
-# Actually simplest is just to Define selected_match immediately after Sidebar Radio at top.
+# Out-of-sample figures from the walk-forward backtest (python backtest.py)
+try:
+    backtest_metrics = load_artifact(METRICS_PATH)
+except FileNotFoundError:
+    backtest_metrics = None
+if backtest_metrics:
+    st.sidebar.metric("Model Accuracy", f"{backtest_metrics['accuracy'] * 100:.1f}%", delta="vs Random (33%)")
+    st.sidebar.info(
+        f"Walk-forward backtest on {backtest_metrics['matches']} matches "
+        f"({backtest_metrics['period'][0]} to {backtest_metrics['period'][1]}): "
+        f"log loss {backtest_metrics['log_loss']:.3f}, Brier {backtest_metrics['brier']:.3f}, "
+        f"ROI {backtest_metrics['roi_favourite']:+.1%} backing the favourite."
+    )
+    if os.path.exists(CALIBRATION_PATH):
+        # backtest.py scores the raw forest; the predictor also applies the calibrator
+        st.sidebar.caption("Backtest figures are for uncalibrated model probabilities. "
+                           f"Live predictions are calibrated ({CALIBRATION_PATH}).")
+else:
+    st.sidebar.metric("Model Accuracy", "n/a", delta="vs Random (33%)", delta_color="off")
+    st.sidebar.info("Run `python backtest.py` to measure out-of-sample accuracy.")
 
 
 # --- Main Layout: 2:3 Split ---
@@ -179,13 +146,13 @@ with col1:
     # Match Header (Logos/VS)
     h_col1, h_col2, h_col3 = st.columns([1, 0.8, 1])
     with h_col1:
-        logo_h = get_img_as_base64(selected_match['home_team_logo'])
+        logo_h = logo_src(selected_match['home_team_logo'])
         st.markdown(f"<div style='text-align: center;'><img src='{logo_h}' width='100'></div>", unsafe_allow_html=True)
         st.markdown(f"<p class='team-name-header'>{selected_match['home_team']}</p>", unsafe_allow_html=True)
     with h_col2:
         st.markdown("<p class='vs-text'>VS</p>", unsafe_allow_html=True)
     with h_col3:
-        logo_a = get_img_as_base64(selected_match['away_team_logo'])
+        logo_a = logo_src(selected_match['away_team_logo'])
         st.markdown(f"<div style='text-align: center;'><img src='{logo_a}' width='100'></div>", unsafe_allow_html=True)
         st.markdown(f"<p class='team-name-header'>{selected_match['away_team']}</p>", unsafe_allow_html=True)
         
@@ -211,9 +178,18 @@ with col1:
 # --- RIGHT COLUMN: The Analytics Hub ---
 with col2:
     st.subheader("📊 Analytics Hub")
+
+    if not predictor_loading.done():
+        with st.spinner("Loading prediction model..."):
+            predictor_loading.result()
+    predictor = get_predictor()
+
+    # Every form / injury combination for this fixture is scored once (one batched model call)
+    # and cached; the sliders only pick a scenario out of the grid
+    scenario = scenario_grid(predictor, selected_match)
     
-    # Run Prediction
-    prediction = predictor.predict_match(simulated_match)
+    # Run Prediction (looked up in the precomputed What-If grid)
+    prediction = scenario.prediction(sim_home_form, sim_away_form, sim_injury)
     
     # Calculate Winner
     probs = {
@@ -246,6 +222,9 @@ with col2:
     </div>
     """, unsafe_allow_html=True)
 
+    # Plotly is only needed from here on; importing it late lets the page start rendering sooner
+    import plotly.graph_objects as go
+
     # Donut Chart
     labels = [f"Home: {selected_match['home_team']}", 'Draw', f"Away: {selected_match['away_team']}"]
     values = [prediction['home_win_prob'], prediction['draw_prob'], prediction['away_win_prob']]
@@ -265,6 +244,29 @@ with col2:
     )
     st.plotly_chart(fig_donut, use_container_width=True)
 
+    # Form Sensitivity Heatmap (same scenario grid, no extra model calls)
+    st.markdown(f"#### 🔥 Form Sensitivity: {selected_match['home_team']} Win %")
+    fig_heat = go.Figure(data=go.Heatmap(
+        z=scenario.sensitivity(sim_injury),
+        x=[f"Form {level}" for level in FORM_LEVELS],
+        y=[f"Form {level}" for level in FORM_LEVELS],
+        colorscale='RdBu_r',
+        zmin=0,
+        zmax=100,
+        hovertemplate=f"{selected_match['home_team']} %{{y}}<br>{selected_match['away_team']} %{{x}}<br>Home Win: %{{z}}%<extra></extra>"
+    ))
+    fig_heat.update_layout(
+        template='plotly_dark',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis_title=f"{selected_match['away_team']} Form",
+        yaxis_title=f"{selected_match['home_team']} Form",
+        font=dict(color='white'),
+        height=300,
+        margin=dict(l=0, r=0, t=10, b=0)
+    )
+    st.plotly_chart(fig_heat, use_container_width=True)
+
     st.write("---")
 
     # Radar Chart
@@ -325,3 +327,5 @@ with col2:
 # Footer
 st.markdown("---")
 st.caption("Powered by Advanced Python Algorithms & Streamlit | Built for Premier League Fans")
+
+rerun_profile.stop()
@@ -0,0 +1,256 @@
+"""
+Walk-forward backtest over the historical season CSVs.
+
+Matches are grouped into matchweeks (Friday to Thursday). For every matchweek after the first
+`--min-train` matches, the model is fitted on all earlier matches only and scores that week, so
+no future result ever reaches training. With `--refit-every K` the forest is refitted from
+scratch every K weeks and warm-updated in between (like train_model.py --incremental).
+
+The encoded feature matrix is built once and stored under .cache/backtest/ (keyed by the CSV
+contents and feature set); worker processes memory-map it, one block of weeks per task.
+
+Reports accuracy, log loss, Brier score and flat-stake betting ROI at the AvgH/AvgD/AvgA odds,
+next to the bookmakers' own implied probabilities, and writes them to metrics.json for the app.
+
+Usage:
+    python backtest.py --workers 4
+    python backtest.py --refit-every 4 --new-trees 20 --features rich
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import log_loss
+
+import shared_matrix
+from predictor import METRICS_PATH
+from team_encoder import TeamEncoder
+from train_model import SEASON_CACHE_DIR, _clean_matches, _encode_matches, _load_matches, _match_features
+
+FEATURE_STORE_DIR = os.path.join('.cache', 'backtest')
+# Bump when the stored arrays change meaning
+FEATURE_STORE_VERSION = 2
+# Forest settings, as in train_model.train
+FOREST_PARAMS = {'n_estimators': 100, 'random_state': 42}
+
+def _store_key(csv_files, feature_set):
+    h = hashlib.sha1(f"{FEATURE_STORE_VERSION}:{feature_set}".encode())
+    for path in csv_files:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def build_feature_store(csv_files, feature_set='basic', workers=None, cache_dir=SEASON_CACHE_DIR):
+    """
+    Encodes every match once, in chronological order, and saves X / y / odds / week / date arrays.
+    Returns the store directory (reused as is when the CSVs have not changed), or None.
+    """
+    store_dir = os.path.join(FEATURE_STORE_DIR, _store_key(csv_files, feature_set))
+    if os.path.exists(os.path.join(store_dir, 'meta.json')):
+        return store_dir
+
+    full_df, file_rows = _load_matches(csv_files, workers, cache_dir)
+    if full_df is None:
+        return None
+    if 'Date' not in full_df.columns:
+        print("Backtesting needs the Date column to order matches.")
+        return None
+    df_clean = _clean_matches(full_df)
+    if df_clean is None:
+        return None
+
+    match_features = None
+    if feature_set == 'rich':
+        match_features, _ = _match_features(full_df, file_rows)
+        if match_features is None:
+            return None
+
+    # Team codes are identifiers only; fitting them on every team leaks no results
+    le = TeamEncoder()
+    le.fit(pd.concat([df_clean['HomeTeam'], df_clean['AwayTeam']]).unique())
+    X, y = _encode_matches(df_clean, le, match_features)
+
+    X, y, dates = shared_matrix.date_order(X, y, full_df.loc[X.index, 'Date'])
+    # Matchweeks run Friday to Thursday, so a weekend round and its midweek games stay together
+    weeks = dates.dt.to_period('W-THU')
+
+    os.makedirs(store_dir, exist_ok=True)
+    shared_matrix.save(store_dir, X, y)
+    np.save(os.path.join(store_dir, 'odds.npy'), X[['AvgH', 'AvgD', 'AvgA']].to_numpy(dtype=np.float64))
+    np.save(os.path.join(store_dir, 'week.npy'), weeks.map(lambda p: p.ordinal).to_numpy(dtype=np.int64))
+    np.save(os.path.join(store_dir, 'date.npy'), dates.to_numpy(dtype='datetime64[D]'))
+    with open(os.path.join(store_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'files': [os.path.basename(p) for p in csv_files],
+            'feature_set': feature_set,
+            'features': list(X.columns),
+            'first_date': str(dates.iloc[0].date()),
+            'last_date': str(dates.iloc[-1].date()),
+        }, f, indent=2)
+    return store_dir
+
+
+def week_bounds(week):
+    """
+    (start, stop) row ranges of each matchweek in the chronologically sorted store.
+    """
+    starts = np.flatnonzero(np.r_[True, week[1:] != week[:-1]])
+    stops = np.r_[starts[1:], len(week)]
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+def _run_block(weeks, new_trees, window):
+    """
+    Scores consecutive weeks: a full fit on everything before the first week, then a warm
+    update (new_trees trees on the last `window` matches) before each following week.
+    Returns [(start, stop, probs)] with probabilities in class order 0 (A), 1 (D), 2 (H).
+    """
+    X, y = shared_matrix.X, shared_matrix.y
+    results = []
+    rf = None
+    for start, stop in weeks:
+        if rf is None:
+            rf = RandomForestClassifier(n_jobs=1, warm_start=True, **FOREST_PARAMS)
+            rf.fit(X[:start], y[:start])
+        else:
+            rf.n_estimators += new_trees
+            lo = max(0, start - window)
+            rf.fit(X[lo:start], y[lo:start])
+        proba = rf.predict_proba(X[start:stop])
+        probs = np.zeros((stop - start, 3))
+        probs[:, rf.classes_.astype(int)] = proba
+        results.append((start, stop, probs))
+    return results
+
+
+def score(y, probs, odds):
+    """
+    Accuracy, log loss, Brier score and ROI of `probs` (n x 3, classes A/D/H) against results `y`.
+    ROI is per unit staked: `favourite` backs the most likely outcome of every match, `value`
+    backs the outcome with the best expected return, only when that return is positive.
+    """
+    odds_by_class = odds[:, ::-1]  # AvgH/AvgD/AvgA -> classes 0 (A), 1 (D), 2 (H)
+    onehot = np.eye(3)[y]
+    pick = probs.argmax(axis=1)
+    rows = np.arange(len(y))
+    won = pick == y
+
+    favourite_profit = np.where(won, odds_by_class[rows, pick] - 1, -1.0)
+    expected = probs * odds_by_class - 1
+    value_pick = expected.argmax(axis=1)
+    value_bet = expected[rows, value_pick] > 0
+    value_profit = np.where(value_pick == y, odds_by_class[rows, value_pick] - 1, -1.0)[value_bet]
+
+    return {
+        'accuracy': round(float(won.mean()), 4),
+        'log_loss': round(float(log_loss(y, np.clip(probs, 1e-15, 1), labels=[0, 1, 2])), 4),
+        'brier': round(float(((probs - onehot) ** 2).sum(axis=1).mean()), 4),
+        'roi_favourite': round(float(favourite_profit.mean()), 4),
+        'roi_value': round(float(value_profit.mean()), 4) if value_bet.any() else None,
+        'value_bets': int(value_bet.sum()),
+    }
+
+
+def backtest(csv_files=None, feature_set='basic', min_train=380, refit_every=1, new_trees=20,
+             window=380, workers=None, cache_dir=SEASON_CACHE_DIR, output=METRICS_PATH):
+    """
+    Walk-forward backtest; writes the summary to `output` and returns it as a dict.
+    """
+    if csv_files is None:
+        csv_files = sorted(glob.glob("*.csv"))
+    started = time.perf_counter()
+    store_dir = build_feature_store(csv_files, feature_set, workers, cache_dir)
+    if store_dir is None:
+        return
+
+    y = np.load(os.path.join(store_dir, 'y.npy'))
+    odds = np.load(os.path.join(store_dir, 'odds.npy'))
+    week = np.load(os.path.join(store_dir, 'week.npy'))
+    date = np.load(os.path.join(store_dir, 'date.npy'))
+    with open(os.path.join(store_dir, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+
+    test_weeks = [(start, stop) for start, stop in week_bounds(week) if start >= min_train]
+    if not test_weeks:
+        print(f"Not enough matches: need more than {min_train} before the first test week.")
+        return
+    blocks = [test_weeks[i:i + refit_every] for i in range(0, len(test_weeks), refit_every)]
+    print(f"Backtesting {len(test_weeks)} matchweeks ({test_weeks[0][0]} -> {len(y)} matches) "
+          f"in {len(blocks)} blocks")
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=shared_matrix.init_worker, initargs=(store_dir,)) as pool:
+        results = [r for block in pool.map(_run_block, blocks, [new_trees] * len(blocks),
+                                           [window] * len(blocks)) for r in block]
+
+    first = test_weeks[0][0]
+    probs = np.zeros((len(y) - first, 3))
+    for start, stop, p in results:
+        probs[start - first:stop - first] = p
+    y_test = y[first:]
+    odds_test = odds[first:]
+
+    # Bookmaker baseline: implied probabilities with the margin removed
+    implied = 1 / odds_test[:, ::-1]
+    implied /= implied.sum(axis=1, keepdims=True)
+
+    summary = {
+        **score(y_test, probs, odds_test),
+        'market': score(y_test, implied, odds_test),
+        'matches': int(len(y_test)),
+        'matchweeks': len(test_weeks),
+        'train_matches_min': int(first),
+        'files': meta['files'],
+        # Dates of the first and last scored match (the training-only weeks are not included)
+        'period': [str(date[first]), meta['last_date']],
+        'feature_set': feature_set,
+        'refit_every': refit_every,
+        'weekly_accuracy': [
+            round(float((p.argmax(axis=1) == y[start:stop]).mean()), 4) for start, stop, p in results
+        ],
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seconds': round(time.perf_counter() - started, 1),
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"Model:  accuracy {summary['accuracy']:.4f}  log loss {summary['log_loss']:.4f}  "
+          f"Brier {summary['brier']:.4f}  ROI {summary['roi_favourite']:+.2%}")
+    m = summary['market']
+    print(f"Market: accuracy {m['accuracy']:.4f}  log loss {m['log_loss']:.4f}  "
+          f"Brier {m['brier']:.4f}  ROI {m['roi_favourite']:+.2%}")
+    print(f"Metrics saved to {output} ({summary['seconds']}s)")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest by matchweek.")
+    parser.add_argument('csv_files', nargs='*', help="Season CSVs (default: *.csv)")
+    parser.add_argument('--features', choices=['basic', 'rich'], default='basic')
+    parser.add_argument('--min-train', type=int, default=380, help="Matches before the first test week")
+    parser.add_argument('--refit-every', type=int, default=1,
+                        help="Weeks between full refits; warm updates in between (default: refit every week)")
+    parser.add_argument('--new-trees', type=int, default=20, help="Trees added per warm update")
+    parser.add_argument('--window', type=int, default=380, help="Recent matches used by a warm update")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--output', default=METRICS_PATH)
+    args = parser.parse_args()
+
+    backtest(
+        csv_files=args.csv_files or None,
+        feature_set=args.features,
+        min_train=args.min_train,
+        refit_every=args.refit_every,
+        new_trees=args.new_trees,
+        window=args.window,
+        workers=args.workers,
+        output=args.output
+    )
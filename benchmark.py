@@ -0,0 +1,281 @@
+"""
+Reproducible benchmark suite for the training and inference hot paths.
+
+Everything runs in a temporary directory on synthetic football-data seasons (seeded), so
+results only depend on the code and the machine. Measured:
+    train_model.train wall time, MatchPredictor.load_model time (cold, registry cleared),
+    single-row predict_match latency percentiles, predict_matches throughput per batch size,
+    get_team_code hit / fuzzy-miss cost, generate_explanation cost and per-row batch
+    explanation cost (text and rule codes).
+
+Results are written as JSON; --compare flags metrics that regressed against an earlier run.
+
+Usage:
+    python benchmark.py --output bench.json
+    python benchmark.py --output bench_new.json --compare bench.json --threshold 0.15
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# Batch sizes for the predict_matches throughput runs
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+# A metric regresses when it is this much worse than the baseline (fraction)
+REGRESSION_THRESHOLD = 0.10
+# Metric name suffixes where a larger value is better; everything else is a time
+HIGHER_IS_BETTER = ('_per_s',)
+
+
+def synthetic_season(n_teams=20, start='2023-08-12', odds_margin=1.05, seed=0):
+    """
+    One double round-robin in football-data format (Date, HomeTeam, AwayTeam, FTHG, FTAG, FTR, AvgH/D/A).
+    Results are drawn from hidden team strengths, and the odds are priced from the same probabilities
+    with a bookmaker overround of `odds_margin` (implied probabilities sum to about 1.05).
+    """
+    rng = np.random.default_rng(seed)
+    teams = [f"Team {i:02d}" for i in range(n_teams)]
+    strength = rng.normal(0, 1, n_teams)
+    pairs = [(h, a) for h in range(n_teams) for a in range(n_teams) if h != a]
+    order = rng.permutation(len(pairs))
+    per_week = max(n_teams // 2, 1)
+
+    home, away = np.array(pairs)[order].T
+    p_home = 0.75 / (1 + np.exp(-(strength[home] - strength[away] + 0.3)))
+    p_away = 0.75 - p_home
+    p_draw = 1 - p_home - p_away
+    u = rng.random(len(pairs))
+    result = np.where(u < p_home, 'H', np.where(u < p_home + p_draw, 'D', 'A'))
+    home_goals = rng.poisson(1.2, len(pairs))
+    away_goals = rng.poisson(1.0, len(pairs))
+    # Make the scoreline agree with the drawn result
+    away_goals = np.where(result == 'D', home_goals, away_goals)
+    home_goals = np.where((result == 'H') & (home_goals <= away_goals), away_goals + 1, home_goals)
+    away_goals = np.where((result == 'A') & (away_goals <= home_goals), home_goals + 1, away_goals)
+    dates = pd.Timestamp(start) + pd.to_timedelta(7 * (np.arange(len(pairs)) // per_week), unit='D')
+
+    return pd.DataFrame({
+        'Div': 'E0',
+        'Date': dates.strftime('%d/%m/%Y'),
+        'HomeTeam': np.array(teams)[home],
+        'AwayTeam': np.array(teams)[away],
+        'FTHG': home_goals,
+        'FTAG': away_goals,
+        'FTR': result,
+        'AvgH': np.round(1 / (p_home * odds_margin), 2),
+        'AvgD': np.round(1 / (p_draw * odds_margin), 2),
+        'AvgA': np.round(1 / (p_away * odds_margin), 2),
+    })
+
+
+def synthetic_fixtures(teams, n, seed=0):
+    """
+    `n` fixtures in the app's format between random pairs of `teams`.
+    """
+    rng = np.random.default_rng(seed)
+    home = rng.integers(0, len(teams), n)
+    away = (home + rng.integers(1, len(teams), n)) % len(teams)
+    odds = np.round(rng.uniform(1.3, 8.0, (n, 3)), 2)
+    forms = ['W', 'D', 'L']
+    return [{
+        'home_team': teams[h],
+        'away_team': teams[a],
+        'avg_odds_home': float(o[0]),
+        'avg_odds_draw': float(o[1]),
+        'avg_odds_away': float(o[2]),
+        'last_5_matches_home': [forms[k] for k in rng.integers(0, 3, 5)],
+        'last_5_matches_away': [forms[k] for k in rng.integers(0, 3, 5)],
+    } for h, a, o in zip(home, away, odds)]
+
+
+def _timed(fn, repeat):
+    """
+    Calls fn() `repeat` times; returns the per-call durations in seconds.
+    """
+    durations = np.empty(repeat)
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn()
+        durations[i] = time.perf_counter() - started
+    return durations
+
+
+def _latency(durations):
+    ms = durations * 1000
+    return {
+        'p50_ms': round(float(np.percentile(ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(ms, 95)), 4),
+        'p99_ms': round(float(np.percentile(ms, 99)), 4),
+        'mean_ms': round(float(ms.mean()), 4),
+    }
+
+
+def _environment():
+    import sklearn
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def run(seasons=3, n_teams=20, repeat=200, batch_sizes=BATCH_SIZES, seed=0, feature_set='basic'):
+    """
+    Runs the whole suite in a temporary directory. Returns the results dict written as JSON.
+    """
+    import model_registry
+    import train_model
+    from explanations import explain_batch, explain_codes
+    from predictor import MatchPredictor
+
+    metrics = {}
+    config = {'seasons': seasons, 'n_teams': n_teams, 'repeat': repeat,
+              'batch_sizes': list(batch_sizes), 'seed': seed, 'feature_set': feature_set}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # Artifact paths are relative: train and load inside the scratch directory
+        os.chdir(workdir)
+        try:
+            csv_files = []
+            for s in range(seasons):
+                path = f"season{s:02d}.csv"
+                start = pd.Timestamp('2015-08-08') + pd.DateOffset(years=s)
+                synthetic_season(n_teams, start=start, seed=seed + s).to_csv(path, index=False)
+                csv_files.append(path)
+            config['matches'] = seasons * n_teams * (n_teams - 1)
+
+            quiet = contextlib.redirect_stdout(io.StringIO())
+            with quiet:
+                started = time.perf_counter()
+                train_model.train(csv_files, cache_dir=None, feature_set=feature_set)
+                metrics['train_s'] = round(time.perf_counter() - started, 4)
+
+            # Cold loads: the registry would otherwise hand back the cached objects
+            def cold_load():
+                model_registry.clear()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    MatchPredictor(cache_size=0)
+            load = _timed(cold_load, max(repeat // 20, 3))
+            metrics['load_model_ms'] = round(float(np.median(load)) * 1000, 4)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                predictor = MatchPredictor(cache_size=0)
+            config['model_type'] = type(predictor.model).__name__
+            teams = [str(t) for t in predictor.encoder.classes_]
+            fixtures = synthetic_fixtures(teams, max(max(batch_sizes), repeat), seed)
+
+            # Single-row latency, with explanation (the app's path)
+            it = iter(fixtures * 2)
+            single = _timed(lambda: predictor.predict_match(next(it)), repeat)
+            for name, value in _latency(single).items():
+                metrics[f'predict_match_{name}'] = value
+
+            for size in batch_sizes:
+                batch = fixtures[:size]
+                n_runs = max(3, min(repeat, 2000 // size))
+                durations = _timed(lambda: predictor.predict_matches(batch, explain=False), n_runs)
+                metrics[f'batch_{size}_rows_per_s'] = round(size / float(np.median(durations)), 1)
+
+            # Exact hits hit the dict; misses go through normalisation + difflib every time
+            hit_name = teams[0]
+            metrics['team_code_hit_us'] = round(
+                float(np.median(_timed(lambda: predictor.get_team_code(hit_name), repeat))) * 1e6, 3)
+
+            def miss():
+                predictor._fuzzy_cache.clear()
+                predictor.get_team_code("Tem 0 FC")
+            with contextlib.redirect_stdout(io.StringIO()):
+                metrics['team_code_miss_us'] = round(float(np.median(_timed(miss, repeat))) * 1e6, 3)
+
+            probs = {'home': 48.2, 'draw': 27.1, 'away': 24.7}
+            it = iter(fixtures * 2)
+            metrics['explanation_us'] = round(float(np.median(
+                _timed(lambda: predictor.generate_explanation(next(it), probs), repeat))) * 1e6, 3)
+
+            # Bulk explanations per row (largest batch), as text and as rule codes
+            batch = fixtures[:max(batch_sizes)]
+            percentages = [[p['home_win_prob'], p['draw_prob'], p['away_win_prob']]
+                           for p in predictor.predict_matches(batch, explain=False)]
+            n_runs = max(3, min(repeat, 2000 // len(batch)))
+            metrics['explanation_batch_row_us'] = round(float(np.median(
+                _timed(lambda: explain_batch(batch, percentages), n_runs))) / len(batch) * 1e6, 3)
+            metrics['explanation_codes_row_us'] = round(float(np.median(
+                _timed(lambda: explain_codes(batch, percentages), n_runs))) / len(batch) * 1e6, 3)
+        finally:
+            model_registry.clear()
+            os.chdir(cwd)
+
+    return {'environment': _environment(), 'config': config, 'metrics': metrics}
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Returns a list of (metric, baseline, current, change) for metrics worse than the baseline
+    by more than `threshold`. change is the relative slowdown (positive = worse).
+    """
+    regressions = []
+    for name, value in current['metrics'].items():
+        old = baseline.get('metrics', {}).get(name)
+        if not old or not value:
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            change = old / value - 1
+        else:
+            change = value / old - 1
+        if change > threshold:
+            regressions.append((name, old, value, change))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark training and inference hot paths.")
+    parser.add_argument('--output', default='benchmark.json', help="Where to write the results JSON")
+    parser.add_argument('--seasons', type=int, default=3, help="Synthetic seasons used for training")
+    parser.add_argument('--teams', type=int, default=20, help="Teams per synthetic season")
+    parser.add_argument('--repeat', type=int, default=200, help="Timed calls per latency metric")
+    parser.add_argument('--batch-sizes', default=",".join(map(str, BATCH_SIZES)),
+                        help="Comma-separated predict_matches batch sizes")
+    parser.add_argument('--features', choices=['basic', 'rich'], default='basic')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compare', default=None, help="Earlier results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    results = run(args.seasons, args.teams, args.repeat,
+                  [int(b) for b in args.batch_sizes.split(',')], args.seed, args.features)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    for name, value in results['metrics'].items():
+        print(f"{name:<28}{value:>14}")
+    print(f"Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        print(f"Compared with {args.compare} (commit {baseline.get('environment', {}).get('commit')}):")
+        for name, old, new, change in regressions:
+            print(f"  REGRESSION {name}: {old} -> {new} ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print("  No regressions.")
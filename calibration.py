@@ -0,0 +1,157 @@
+"""
+Probability calibration for the match model.
+
+Forest vote fractions are not calibrated probabilities. train_model.train fits a calibrator on
+out-of-fold predictions (every match scored by a forest fitted without it) and saves it to
+calibration.json; the predictor applies it to every prediction as a small vectorized step.
+
+Methods:
+    temperature   p_k ∝ p_k ** (1 / T), one parameter; keeps every prediction's favourite
+    isotonic      per-outcome monotone piecewise-linear map, rows renormalized to sum to 1
+
+Only NumPy is needed to apply a calibrator; fitting uses SciPy / scikit-learn.
+Probability arrays are (n, 3) in class order 0 (A), 1 (D), 2 (H), as in the model.
+"""
+import numpy as np
+
+CALIBRATION_PATH = 'calibration.json'
+METHODS = ('temperature', 'isotonic')
+# Smallest calibrated probability; zero vote fractions are raised to it before taking logs
+# (below one vote of a 100-tree forest)
+PROB_FLOOR = 1e-3
+# Folds used to cross-fit the calibrator when reporting its metrics
+METRIC_FOLDS = 5
+# Confidence bins for the expected calibration error
+ECE_BINS = 10
+
+
+class Calibrator:
+    """
+    A fitted calibrator; transform(probs) maps raw model probabilities to calibrated ones.
+    """
+
+    def __init__(self, method, temperature=1.0, thresholds=None):
+        self.method = method
+        self.temperature = temperature
+        # isotonic: one (x, y) pair of arrays per class
+        self.thresholds = thresholds or []
+
+    def transform(self, probs):
+        probs = np.asarray(probs, dtype=np.float64)
+        if self.method == 'temperature':
+            # softmax(log p / T), written as a power: no log / exp per element
+            scaled = np.clip(probs, PROB_FLOOR, 1.0) ** (1.0 / self.temperature)
+            return scaled / scaled.sum(axis=1, keepdims=True)
+
+        out = np.empty_like(probs)
+        for k, (x, y) in enumerate(self.thresholds):
+            out[:, k] = np.interp(probs[:, k], x, y)
+        # No outcome is ever certain to be impossible
+        np.maximum(out, PROB_FLOOR, out=out)
+        return out / out.sum(axis=1, keepdims=True)
+
+    def to_dict(self):
+        return {
+            'method': self.method,
+            'temperature': self.temperature,
+            'thresholds': [[x.tolist(), y.tolist()] for x, y in self.thresholds],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['method'],
+            data.get('temperature', 1.0),
+            [(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+             for x, y in data.get('thresholds', [])]
+        )
+
+
+def fit_temperature(probs, y):
+    """
+    Temperature minimizing the log loss of the scaled probabilities.
+    """
+    from scipy.optimize import minimize_scalar
+
+    logp = np.log(np.clip(probs, PROB_FLOOR, 1.0))
+    rows = np.arange(len(y))
+
+    def nll(log_t):
+        scaled = logp / np.exp(log_t)
+        scaled -= scaled.max(axis=1, keepdims=True)
+        return -(scaled[rows, y] - np.log(np.exp(scaled).sum(axis=1))).mean()
+
+    # Searched on log T so both directions (sharpening and softening) are equally reachable
+    result = minimize_scalar(nll, bounds=(np.log(0.05), np.log(20.0)), method='bounded')
+    return Calibrator('temperature', temperature=float(np.exp(result.x)))
+
+
+def fit_isotonic(probs, y):
+    """
+    One-vs-rest isotonic regression per outcome.
+    """
+    from sklearn.isotonic import IsotonicRegression
+
+    thresholds = []
+    for k in range(probs.shape[1]):
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip')
+        iso.fit(probs[:, k], (y == k).astype(np.float64))
+        thresholds.append((iso.X_thresholds_.astype(np.float64), iso.y_thresholds_.astype(np.float64)))
+    return Calibrator('isotonic', thresholds=thresholds)
+
+
+def fit(probs, y, method='temperature'):
+    if method not in METHODS:
+        raise ValueError(f"Unknown calibration method: {method}")
+    probs = np.asarray(probs, dtype=np.float64)
+    y = np.asarray(y, dtype=np.int64)
+    return fit_temperature(probs, y) if method == 'temperature' else fit_isotonic(probs, y)
+
+
+def calibration_metrics(probs, y):
+    """
+    Log loss, Brier score and expected calibration error (ECE, on the favourite's probability).
+    """
+    probs = np.asarray(probs, dtype=np.float64)
+    y = np.asarray(y, dtype=np.int64)
+    rows = np.arange(len(y))
+    confidence = probs.max(axis=1)
+    correct = probs.argmax(axis=1) == y
+    bins = np.minimum((confidence * ECE_BINS).astype(int), ECE_BINS - 1)
+    counts = np.bincount(bins, minlength=ECE_BINS)
+    gap = np.abs(np.bincount(bins, confidence - correct, minlength=ECE_BINS))
+    return {
+        'log_loss': round(float(-np.log(np.clip(probs[rows, y], 1e-15, 1)).mean()), 4),
+        'brier': round(float(((probs - np.eye(probs.shape[1])[y]) ** 2).sum(axis=1).mean()), 4),
+        'ece': round(float(gap[counts > 0].sum() / len(y)), 4),
+        'accuracy': round(float(correct.mean()), 4),
+    }
+
+
+def fit_and_report(probs, y, method='temperature', odds=None, folds=METRIC_FOLDS, seed=42):
+    """
+    Fits the calibrator on all out-of-fold predictions and reports metrics for the raw and
+    calibrated probabilities (and the bookmakers' margin-free implied probabilities if `odds`,
+    an (n, 3) AvgH/AvgD/AvgA array, is given). The calibrated metrics are cross-fitted: each
+    fold is scored by a calibrator fitted on the other folds, so they are not in-sample.
+    Returns (calibrator, metrics dict).
+    """
+    probs = np.asarray(probs, dtype=np.float64)
+    y = np.asarray(y, dtype=np.int64)
+    calibrator = fit(probs, y, method)
+
+    fold = np.random.default_rng(seed).permutation(len(y)) % folds
+    crossfit = np.empty_like(probs)
+    for k in range(folds):
+        test = fold == k
+        crossfit[test] = fit(probs[~test], y[~test], method).transform(probs[test])
+
+    metrics = {
+        'matches': int(len(y)),
+        'raw': calibration_metrics(probs, y),
+        'calibrated': calibration_metrics(crossfit, y),
+    }
+    if odds is not None:
+        implied = 1 / np.asarray(odds, dtype=np.float64)[:, ::-1]
+        metrics['market'] = calibration_metrics(implied / implied.sum(axis=1, keepdims=True), y)
+    return calibrator, metrics
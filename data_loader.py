@@ -1,143 +1,283 @@
+import codecs
+import json
+import os
+import threading
+import time
 from datetime import datetime, timedelta
 
-import requests
+import instrumentation
+from enrichment import PROVIDER_RETRIES, RETRY_BACKOFF, enrich, get_session
+from fixture_store import load_fixtures
+from team_names import FPL_ALIASES
 
-def fetch_fpl_strength():
+FPL_URL = "https://fantasy.premierleague.com/api/bootstrap-static/"
+# Seconds before a cached FPL payload is considered stale (served anyway, refreshed in background)
+FPL_CACHE_TTL = float(os.environ.get("FPL_CACHE_TTL", 3600))
+# On-disk copy used for cold starts
+FPL_CACHE_PATH = os.environ.get("FPL_CACHE_PATH", os.path.join(".cache", "fpl_strength.json"))
+# Upcoming fixtures (JSON / JSONL / CSV / Parquet, see fixture_store.py)
+FIXTURES_PATH = os.environ.get("FIXTURES_PATH", "fixtures.json")
+# Seconds get_current_fixtures waits for enrichment sources before using what has arrived
+ENRICHMENT_DEADLINE = float(os.environ.get("ENRICHMENT_DEADLINE", 10))
+# Seconds before retrying after a failed FPL fetch; doubled after each consecutive failure up to the max
+FPL_RETRY_BACKOFF = 30
+FPL_RETRY_BACKOFF_MAX = 900
+# Bytes read per iteration when streaming the bootstrap-static body
+FPL_CHUNK_SIZE = 64 * 1024
+
+
+def parse_fpl_teams(teams):
     """
-    Fetches official strength metrics from FPL API.
-    Returns a dict mapping Team Name -> Strength Dict
+    Builds the Team Name -> Strength Dict map from the FPL 'teams' array.
+    """
+    strength_map = {}
+    for t in teams:
+        name = t['name']
+        strength_map[name] = {
+            'strength': t['strength'],
+            'strength_attack_home': t['strength_attack_home'],
+            'strength_attack_away': t['strength_attack_away'],
+            'strength_defence_home': t['strength_defence_home'],
+            'strength_defence_away': t['strength_defence_away'],
+            'strength_overall_home': t['strength_overall_home'],
+            'strength_overall_away': t['strength_overall_away']
+        }
+        # Custom mappings
+        if name in FPL_ALIASES:
+            strength_map[FPL_ALIASES[name]] = strength_map[name]
+
+    return strength_map
+
+
+def extract_json_member(chunks, key):
     """
-    url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-    try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        teams = data['teams']
-        
-        strength_map = {}
-        for t in teams:
-            name = t['name']
-            strength_map[name] = {
-                'strength': t['strength'],
-                'strength_attack_home': t['strength_attack_home'],
-                'strength_attack_away': t['strength_attack_away'],
-                'strength_defence_home': t['strength_defence_home'],
-                'strength_defence_away': t['strength_defence_away'],
-                'strength_overall_home': t['strength_overall_home'],
-                'strength_overall_away': t['strength_overall_away']
+    Returns the value of top-level member `key` from a JSON object streamed as byte chunks.
+
+    Members are decoded one at a time with the C decoder and dropped unless they are `key`,
+    and reading stops as soon as `key` is complete, so the rest of the document is never
+    downloaded or parsed. For bootstrap-static, 'teams' precedes the large 'elements' array.
+    Raises KeyError if the object has no such member.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buf = ''
+    eof = False
+
+    def read_more():
+        nonlocal buf, eof
+        for chunk in chunks:
+            if chunk:
+                buf += utf8.decode(chunk)
+                return True
+        buf += utf8.decode(b'', final=True)
+        eof = True
+        return False
+
+    def next_char():
+        # Drops leading whitespace and returns the next significant character ('' at EOF)
+        nonlocal buf
+        while True:
+            buf = buf.lstrip()
+            if buf or not read_more():
+                return buf[:1]
+
+    def decode_next():
+        # Decodes the next complete JSON value at the start of buf and consumes it
+        nonlocal buf
+        retry_at = 0
+        while True:
+            if len(buf) >= retry_at or eof:
+                try:
+                    value, end = decoder.raw_decode(buf)
+                    # A value ending exactly at the buffer edge may be a truncated number
+                    if end < len(buf) or eof:
+                        buf = buf[end:]
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                # Wait until the buffer doubles before re-parsing, keeping retries linear
+                retry_at = 2 * len(buf)
+            if not read_more() and not buf:
+                raise json.JSONDecodeError("Unexpected end of document", buf, 0)
+
+    if next_char() != '{':
+        raise json.JSONDecodeError("Expected a JSON object", buf, 0)
+    buf = buf[1:]
+    while True:
+        c = next_char()
+        if c == ',':
+            buf = buf[1:]
+            c = next_char()
+        if c != '"':
+            raise KeyError(key)
+        name = decode_next()
+        if next_char() != ':':
+            raise json.JSONDecodeError("Expected ':' after member name", buf, 0)
+        buf = buf[1:]
+        next_char()
+        value = decode_next()
+        if name == key:
+            return value
+
+
+class FPLStrengthCache:
+    """
+    TTL cache for the FPL strength map with stale-while-revalidate semantics.
+
+    - Fresh entries are returned directly.
+    - Stale entries are returned immediately while one background thread refreshes them.
+    - A cold start with no on-disk copy also fetches in the background and returns None
+      until the first fetch lands, so get() never waits on the network.
+    Refreshes send If-None-Match / If-Modified-Since, so an unchanged payload costs a 304.
+    Each refresh retries `retries` times (enrichment's RETRY_BACKOFF, doubled) before failing.
+    A failed refresh keeps serving the last good copy, and no new refresh starts until the
+    retry backoff (doubled after each consecutive failure) has passed.
+    """
+
+    def __init__(self, url=FPL_URL, ttl=FPL_CACHE_TTL, path=FPL_CACHE_PATH, timeout=5, retries=PROVIDER_RETRIES,
+                 retry_backoff=FPL_RETRY_BACKOFF, retry_backoff_max=FPL_RETRY_BACKOFF_MAX):
+        self.url = url
+        self.ttl = ttl
+        self.path = path
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._value = None
+        self._fetched_at = 0.0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._etag = None
+        self._last_modified = None
+        self._load_from_disk()
+
+    def get(self):
+        """
+        Returns the strength map (possibly stale), or None if it has not been fetched yet.
+        """
+        now = time.time()
+        if (self._value is None or now - self._fetched_at > self.ttl) and now >= self._retry_at:
+            self._refresh_in_background()
+        return self._value
+
+    def refresh(self):
+        """
+        Fetches the payload now (conditional request if we hold a copy). Returns True on success.
+        """
+        pause = RETRY_BACKOFF
+        for attempt in range(self.retries + 1):
+            try:
+                return self._fetch()
+            except Exception as e:
+                if attempt < self.retries:
+                    time.sleep(pause)
+                    pause *= 2
+                    continue
+                instrumentation.count('fpl_fetch_error')
+                with self._lock:
+                    self._failures += 1
+                    delay = min(self.retry_backoff * 2 ** (self._failures - 1), self.retry_backoff_max)
+                    self._retry_at = time.time() + delay
+                print(f"Error fetching FPL data: {e} (next attempt in {delay:.0f}s)")
+                return False
+
+    def _fetch(self):
+        headers = {}
+        if self._value is not None:
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+        # Pooled session shared with the other enrichment sources (requests is imported on first use)
+        with instrumentation.span('fpl_fetch'), \
+                get_session().get(self.url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304:
+                instrumentation.count('fpl_not_modified')
+                with self._lock:
+                    self._failures = 0
+                    self._retry_at = 0.0
+                    self._fetched_at = time.time()
+                self._save_to_disk()
+                return True
+            response.raise_for_status()
+            # Only the 'teams' array is parsed; the connection is closed right after it
+            teams = extract_json_member(response.iter_content(chunk_size=FPL_CHUNK_SIZE), 'teams')
+        strength_map = parse_fpl_teams(teams)
+
+        with self._lock:
+            self._failures = 0
+            self._retry_at = 0.0
+            self._value = strength_map
+            self._fetched_at = time.time()
+            self._etag = response.headers.get('ETag')
+            self._last_modified = response.headers.get('Last-Modified')
+        self._save_to_disk()
+        return True
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+            self._refresh_thread.start()
+
+    def _load_from_disk(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            self._value = cached['strength_map']
+            self._fetched_at = cached['fetched_at']
+            self._etag = cached.get('etag')
+            self._last_modified = cached.get('last_modified')
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable FPL cache {self.path}: {e}")
+
+    def _save_to_disk(self):
+        if not self.path:
+            return
+        with self._lock:
+            cached = {
+                'strength_map': self._value,
+                'fetched_at': self._fetched_at,
+                'etag': self._etag,
+                'last_modified': self._last_modified
             }
-            # Custom mappings
-            if name == "Man Utd": strength_map["Manchester United"] = strength_map[name]
-            if name == "Man City": strength_map["Manchester City"] = strength_map[name] 
-            if name == "Spurs": strength_map["Tottenham"] = strength_map[name]
-            if name == "Forest": strength_map["Nottingham Forest"] = strength_map[name]
-
-        return strength_map
-    except Exception as e:
-        print(f"Error fetching FPL data: {e}")
-        return None
-
-def get_current_fixtures():
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cached, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not persist FPL cache: {e}")
+
+
+_fpl_cache = None
+
+
+def fetch_fpl_strength():
     """
-    Returns a list of mock Premier League fixtures for the upcoming matchweek.
-    Each fixture is a dictionary containing match details.
+    Fetches official strength metrics from FPL API (through the shared FPLStrengthCache).
+    Returns a dict mapping Team Name -> Strength Dict
     """
-    
-    # Matchweek 22 Fixtures
-    fixtures = [
-        {
-            "id": 1,
-            "home_team": "Manchester United",
-            "away_team": "Manchester City",
-            "match_time": "2026-01-17 14:30:00",
-            "weather_condition": "Rainy 🌧️",
-            "home_injuries": ["Luke Shaw (Muscle)", "Mason Mount (Calf)"],
-            "away_injuries": ["Kevin De Bruyne (Rest)", "Rodri (Suspended)"],
-            "last_5_matches_home": ["L", "W", "D", "D", "D"], # Man Utd Form (Real Data)
-            "last_5_matches_away": ["W", "W", "D", "D", "D"], # Man City Form (Real Data)
-            "home_team_logo": "https://upload.wikimedia.org/wikipedia/en/thumb/7/7a/Manchester_United_FC_crest.svg/1200px-Manchester_United_FC_crest.svg.png",
-            "away_team_logo": "https://upload.wikimedia.org/wikipedia/en/thumb/e/eb/Manchester_City_FC_badge.svg/1200px-Manchester_City_FC_badge.svg.png",
-            "home_strength": 2, # Fallback
-            "away_strength": 1, 
-            "avg_odds_home": 3.40,
-            "avg_odds_draw": 3.10,
-            "avg_odds_away": 1.60
-        },
-        # ... Other fixtures ...
-
-        {
-            "id": 2,
-            "home_team": "Tottenham",
-            "away_team": "West Ham",
-            "match_time": "2026-01-17 17:00:00",
-            "weather_condition": "Cloudy ☁️",
-            "home_injuries": ["Maddison (Ankle)", "Van de Ven (Hamstring)"],
-            "away_injuries": ["Antonio (Knee)", "Paqueta (Calf)"],
-            "last_5_matches_home": ["L", "W", "D", "D", "L"], # Tottenham Form
-            "last_5_matches_away": ["L", "L", "D", "L", "L"], # West Ham Form
-            "home_team_logo": "https://upload.wikimedia.org/wikipedia/en/thumb/b/b4/Tottenham_Hotspur.svg/1200px-Tottenham_Hotspur.svg.png",
-            "away_team_logo": "https://upload.wikimedia.org/wikipedia/en/thumb/c/c2/West_Ham_United_FC_logo.svg/1200px-West_Ham_United_FC_logo.svg.png",
-            "home_strength": 2,
-            "away_strength": 2,
-            "avg_odds_home": 1.80,
-            "avg_odds_draw": 3.40,
-            "avg_odds_away": 4.10
-        },
-        {
-            "id": 3,
-            "home_team": "Nottingham Forest",
-            "away_team": "Arsenal",
-            "match_time": "2026-01-17 19:30:00",
-            "weather_condition": "Cold Night ❄️",
-            "home_injuries": ["Awoniyi (Groin)"],
-            "away_injuries": ["Timber (Knee)", "Partey (Thigh)"],
-            "last_5_matches_home": ["L", "L", "L", "L", "W"], # Nottingham Forest Form
-            "last_5_matches_away": ["W", "W", "W", "W", "D"], # Arsenal Form
-            "home_team_logo": "assets/nottm_forest_logo.png", # Updated from User Upload
-            "away_team_logo": "https://upload.wikimedia.org/wikipedia/en/thumb/5/53/Arsenal_FC.svg/1200px-Arsenal_FC.svg.png",
-            "home_strength": 3,
-            "away_strength": 1,
-            "avg_odds_home": 6.50,
-            "avg_odds_draw": 4.20,
-            "avg_odds_away": 1.45
-        },
-        {
-            "id": 4,
-            "home_team": "Liverpool",
-            "away_team": "Burnley",
-            "match_time": "2026-01-17 17:00:00",
-            "weather_condition": "Windy 💨",
-            "home_injuries": ["Alisson (Hamstring)", "Jota (Knee)"],
-            "away_injuries": ["Foster (Illness)"],
-            "last_5_matches_home": ["W", "W", "D", "D", "D"], # Liverpool Form
-            "last_5_matches_away": ["D", "D", "L", "L", "D"], # Burnley Form
-            "home_team_logo": "https://upload.wikimedia.org/wikipedia/en/thumb/0/0c/Liverpool_FC.svg/1200px-Liverpool_FC.svg.png",
-            "away_team_logo": "assets/burnley_logo.png", # Updated from User Upload
-            "home_strength": 1,
-            "away_strength": 3,
-            "avg_odds_home": 1.15,
-            "avg_odds_draw": 7.50,
-            "avg_odds_away": 16.00
-        }
-    ]
-    
-    # Enrich with FPL Data (Fetch Real Data)
-    fpl_data = fetch_fpl_strength()
-    
-    if fpl_data:
-        for f in fixtures:
-            h_team = f['home_team']
-            a_team = f['away_team']
-            
-            # Try to match names
-            if h_team in fpl_data:
-                f['home_strength_attack'] = fpl_data[h_team]['strength_attack_home']
-                f['home_strength_defence'] = fpl_data[h_team]['strength_defence_home']
-                f['home_strength_overall'] = fpl_data[h_team]['strength_overall_home']
-            
-            if a_team in fpl_data:
-                f['away_strength_attack'] = fpl_data[a_team]['strength_attack_away']
-                f['away_strength_defence'] = fpl_data[a_team]['strength_defence_away']
-                f['away_strength_overall'] = fpl_data[a_team]['strength_overall_away']
+    global _fpl_cache
+    if _fpl_cache is None:
+        _fpl_cache = FPLStrengthCache()
+    return _fpl_cache.get()
 
+def get_current_fixtures(path=FIXTURES_PATH, providers=None, deadline=ENRICHMENT_DEADLINE):
+    """
+    Returns the upcoming matchweek's fixtures as a FixtureStore, loaded from `path`
+    (JSON / JSONL / CSV / Parquet) and enriched concurrently by `providers`
+    (default: enrichment.default_providers(); FPL strength plus any configured odds / injuries / weather).
+    Sources that fail or miss the deadline leave the file's values in place.
+    """
+    fixtures = load_fixtures(path)
+    enrich(fixtures, providers, deadline)
     return fixtures
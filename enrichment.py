@@ -0,0 +1,266 @@
+"""
+Concurrent fixture enrichment.
+
+Each data source is a Provider that returns column updates for a FixtureStore. enrich() runs
+all providers at once on a thread pool, sharing one pooled requests.Session, so the page waits
+for the slowest source rather than the sum of all of them. Every provider has its own timeout
+and retry budget, and a failing or slow provider only costs its own columns: the fixtures keep
+the values from the fixture file for those fields.
+
+HTTP sources are cached per URL for ENRICHMENT_CACHE_TTL seconds. Only the first fetch of a URL
+waits on the network; after that a stale copy is served at once while one background thread
+refetches it, so page reruns do not repeat the requests.
+
+Built-in providers:
+    FPLStrengthProvider   FPL attack / defence / overall ratings (through data_loader's cache)
+    HTTPFieldsProvider    any JSON endpoint keyed by fixture id or team name; configured from
+                          ODDS_URL, INJURIES_URL and WEATHER_URL when those are set
+
+Endpoint formats (HTTPFieldsProvider):
+    key='id':   {"1": {"avg_odds_home": 3.4, ...}, ...}       -> fields of fixture 1
+    key='team': {"Arsenal": {"injuries": ["Timber (Knee)"]}}  -> home_injuries / away_injuries
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+import numpy as np
+
+import instrumentation
+from fixture_store import FLOAT_COLUMNS, _is_missing
+
+# Per-provider defaults: seconds per HTTP attempt, extra attempts after a failure
+PROVIDER_TIMEOUT = float(os.environ.get("ENRICHMENT_TIMEOUT", 5))
+PROVIDER_RETRIES = int(os.environ.get("ENRICHMENT_RETRIES", 2))
+# Seconds between retries, doubled on each attempt
+RETRY_BACKOFF = 0.2
+# Seconds a fetched HTTP source is served before it is refetched (in the background)
+ENRICHMENT_CACHE_TTL = float(os.environ.get("ENRICHMENT_CACHE_TTL", 300))
+# Connections kept per host in the shared session
+POOL_SIZE = 16
+# Optional endpoints for the HTTP providers
+ODDS_URL = os.environ.get("ODDS_URL")
+INJURIES_URL = os.environ.get("INJURIES_URL")
+WEATHER_URL = os.environ.get("WEATHER_URL")
+
+_session = None
+_session_lock = threading.Lock()
+# url -> {'data', 'fetched_at', 'refreshing'}, shared by every provider instance
+_json_cache = {}
+_json_cache_lock = threading.Lock()
+
+
+def get_session():
+    """
+    The process-wide requests.Session: keep-alive connections are reused across providers and pages.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+class Provider(ABC):
+    """
+    One enrichment source. fetch(fixtures) returns {column: {row: value}}; rows left out keep
+    their current value.
+    """
+    name = "provider"
+
+    def __init__(self, timeout=PROVIDER_TIMEOUT, retries=PROVIDER_RETRIES, cache_ttl=ENRICHMENT_CACHE_TTL):
+        self.timeout = timeout
+        self.retries = retries
+        self.cache_ttl = cache_ttl
+
+    @abstractmethod
+    def fetch(self, fixtures):
+        """
+        Column updates for `fixtures`; any exception marks the source as failed.
+        """
+
+    def get_json(self, url, **kwargs):
+        """
+        GET through the shared session with this provider's timeout and retries.
+        """
+        delay = RETRY_BACKOFF
+        for attempt in range(self.retries + 1):
+            try:
+                response = get_session().get(url, timeout=self.timeout, **kwargs)
+                response.raise_for_status()
+                return response.json()
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    def get_cached_json(self, url):
+        """
+        get_json through the shared TTL cache. A stale copy is returned immediately while one
+        background thread refetches it; a failed refetch keeps the copy for another TTL.
+        """
+        with _json_cache_lock:
+            entry = _json_cache.get(url)
+            if entry is not None and time.time() - entry['fetched_at'] >= self.cache_ttl and not entry['refreshing']:
+                entry['refreshing'] = True
+                threading.Thread(target=self._refetch, args=(url, entry), daemon=True).start()
+        if entry is not None:
+            instrumentation.count(f'enrich.{self.name}.cached')
+            return entry['data']
+
+        data = self.get_json(url)
+        with _json_cache_lock:
+            _json_cache[url] = {'data': data, 'fetched_at': time.time(), 'refreshing': False}
+        return data
+
+    def _refetch(self, url, entry):
+        try:
+            data = self.get_json(url)
+        except Exception as e:
+            data = entry['data']
+            print(f"Error refreshing enrichment source '{self.name}': {e}")
+        with _json_cache_lock:
+            _json_cache[url] = {'data': data, 'fetched_at': time.time(), 'refreshing': False}
+
+
+class FPLStrengthProvider(Provider):
+    """
+    Home / away strength ratings from the FPL API (cached, retried and refreshed by data_loader).
+    Only fills ratings the fixture file leaves empty; teams unknown to FPL are left as they are.
+    """
+    name = "fpl"
+
+    def fetch(self, fixtures):
+        from data_loader import fetch_fpl_strength
+        fpl_data = fetch_fpl_strength()
+        if not fpl_data:
+            raise RuntimeError("no FPL strength data available")
+
+        updates = {}
+        for side in ('home', 'away'):
+            teams = fixtures.column(f'{side}_team')
+            for metric in ('attack', 'defence', 'overall'):
+                key = f'strength_{metric}_{side}'
+                column = f'{side}_strength_{metric}'
+                current = fixtures.column(column) if column in fixtures.names else [None] * len(fixtures)
+                updates[column] = {
+                    row: fpl_data[team][key] for row, (team, value) in enumerate(zip(teams, current))
+                    if team in fpl_data and _is_missing(value)
+                }
+        return updates
+
+
+class HTTPFieldsProvider(Provider):
+    """
+    Copies `fields` from a JSON endpoint keyed by fixture id (key='id') or by team name (key='team',
+    writing home_<field> / away_<field>).
+    """
+
+    def __init__(self, name, url, fields, key='id', **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.url = url
+        self.fields = fields
+        self.key = key
+
+    def fetch(self, fixtures):
+        data = self.get_cached_json(self.url)
+        updates = {}
+        if self.key == 'team':
+            for side in ('home', 'away'):
+                for row, team in enumerate(fixtures.column(f'{side}_team')):
+                    entry = data.get(team)
+                    if entry is None:
+                        continue
+                    for field in self.fields:
+                        if field in entry:
+                            updates.setdefault(f'{side}_{field}', {})[row] = entry[field]
+        else:
+            for row, fixture_id in enumerate(fixtures.column('id')):
+                entry = data.get(str(fixture_id))
+                if entry is None:
+                    continue
+                for field in self.fields:
+                    if field in entry:
+                        updates.setdefault(field, {})[row] = entry[field]
+        return updates
+
+
+def default_providers():
+    """
+    FPL strength always; odds, injuries and weather when their endpoint is configured.
+    """
+    providers = [FPLStrengthProvider()]
+    if ODDS_URL:
+        providers.append(HTTPFieldsProvider('odds', ODDS_URL, ('avg_odds_home', 'avg_odds_draw', 'avg_odds_away')))
+    if INJURIES_URL:
+        providers.append(HTTPFieldsProvider('injuries', INJURIES_URL, ('injuries',), key='team'))
+    if WEATHER_URL:
+        providers.append(HTTPFieldsProvider('weather', WEATHER_URL, ('weather_condition',)))
+    return providers
+
+
+def _run(provider, fixtures):
+    """
+    (updates, error, seconds) for one provider; exceptions become the error message.
+    """
+    started = time.perf_counter()
+    try:
+        with instrumentation.span(f'enrich.{provider.name}'):
+            updates = provider.fetch(fixtures)
+        return updates, None, time.perf_counter() - started
+    except Exception as e:
+        return None, str(e) or type(e).__name__, time.perf_counter() - started
+
+
+def enrich(fixtures, providers=None, deadline=None):
+    """
+    Runs every provider concurrently and applies their column updates to the FixtureStore.
+    Providers that fail, or are still running after `deadline` seconds, are skipped.
+    Returns {provider name: {'ok': bool, 'seconds': float, 'error': str or None}}.
+    """
+    providers = default_providers() if providers is None else providers
+    if not providers:
+        return {}
+    started = time.perf_counter()
+    # Not a context manager: a provider past the deadline must not hold up the page
+    pool = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix='enrich')
+    futures = {pool.submit(_run, p, fixtures): p for p in providers}
+    done, _ = wait(futures, timeout=deadline)
+    pool.shutdown(wait=False)
+
+    report = {}
+    for future, provider in futures.items():
+        if future not in done:
+            report[provider.name] = {'ok': False, 'seconds': round(time.perf_counter() - started, 3),
+                                     'error': f"timed out after {deadline}s"}
+            continue
+        updates, error, seconds = future.result()
+        if error is None:
+            for column, values in updates.items():
+                _apply(fixtures, column, values)
+        report[provider.name] = {'ok': error is None, 'seconds': round(seconds, 3), 'error': error}
+
+    for name, status in report.items():
+        if not status['ok']:
+            instrumentation.count(f'enrich.{name}.failed')
+            print(f"Enrichment source '{name}' unavailable: {status['error']}")
+    return report
+
+
+def _apply(fixtures, column, values):
+    if column in fixtures.names:
+        current = list(fixtures.column(column))
+    else:
+        current = [np.nan if column in FLOAT_COLUMNS else None] * len(fixtures)
+    for row, value in values.items():
+        current[row] = value
+    fixtures.set_column(column, current)
@@ -0,0 +1,228 @@
+"""
+Rule/template explanation engine.
+
+The rules behind MatchPredictor.generate_explanation are evaluated with NumPy over whole columns
+(win/draw/loss probabilities, FPL strengths, form counts), giving every fixture up to three rule
+codes, one per sentence slot:
+
+    strength     attack_home, attack_away
+    confidence   draw, strong, edge, uncertain
+    form         form_home, form_away, bounce_back
+
+Text is then rendered from the active locale's templates. Rendered strings are memoized by
+(rules, teams, rating), which repeat heavily in bulk jobs, so most rows cost a dict lookup.
+Bulk consumers can skip text altogether with explain_codes() (an int8 matrix) or
+rule_names() ("strong form_home").
+
+Locales: 'en' (the original wording) and 'es'. Add one with register_locale(name, templates) or
+set EXPLANATION_LOCALE to pick the default.
+"""
+import os
+import threading
+import numpy as np
+
+# Rule ids used in explain_codes(); 0 means the slot has no sentence
+RULES = ('', 'attack_home', 'attack_away', 'draw', 'strong', 'edge', 'uncertain',
+         'form_home', 'form_away', 'bounce_back')
+RULE_IDS = {name: i for i, name in enumerate(RULES)}
+# Sentence slots, in output order
+SLOTS = ('strength', 'confidence', 'form')
+
+# Placeholders: {home}, {away}, {winner} (the favoured team), {rating} (home attack rating)
+TEMPLATES = {
+    'en': {
+        'attack_home': "{home}'s attack (Rated {rating}) is expected to overwhelm {away}'s defense.",
+        'attack_away': "{away}'s superior attacking options are the key difference.",
+        'draw': "The model predicts a deadlock due to evenly matched historical performance.",
+        'strong': "Strong statistical advantage detected for {winner}.",
+        'edge': "A tightly contested match is expected, with a slight edge for {winner}.",
+        'uncertain': "The outcome is uncertain, but {winner} is marginally favored.",
+        'form_home': "Recent form is a key differentiator.",
+        'form_away': "{winner} enters the match in better form.",
+        'bounce_back': "Despite recent struggles, {winner} is tipped to bounce back.",
+    },
+    'es': {
+        'attack_home': "Se espera que el ataque de {home} (valorado en {rating}) desborde la defensa de {away}.",
+        'attack_away': "Las mejores opciones ofensivas de {away} son la diferencia clave.",
+        'draw': "El modelo prevé un empate por el rendimiento histórico igualado de ambos equipos.",
+        'strong': "Se detecta una clara ventaja estadística para {winner}.",
+        'edge': "Se espera un partido muy disputado, con una ligera ventaja para {winner}.",
+        'uncertain': "El resultado es incierto, pero {winner} parte como ligero favorito.",
+        'form_home': "La forma reciente es un factor diferencial.",
+        'form_away': "{winner} llega al partido en mejor forma.",
+        'bounce_back': "Pese a sus últimos tropiezos, {winner} es favorito para recuperarse.",
+    },
+}
+DEFAULT_LOCALE = os.environ.get('EXPLANATION_LOCALE', 'en')
+
+# FPL ratings are usually around 1000-1350; this gap counts as a clear mismatch
+STRENGTH_MARGIN = 50
+# Win probability (%) above which the favourite has a strong / slight edge
+STRONG_PROB = 60
+EDGE_PROB = 40
+# Losses in the last five that make a home favourite a "bounce back" pick
+BOUNCE_BACK_LOSSES = 3
+
+# Rendered text per (locale, rules, teams, rating); cleared when it reaches this many entries
+TEXT_CACHE_SIZE = 50000
+
+_text_cache = {}
+_text_lock = threading.Lock()
+
+
+def register_locale(name, templates):
+    """
+    Adds (or replaces) a locale. `templates` needs a format string for every rule.
+    """
+    missing = [rule for rule in RULES[1:] if rule not in templates]
+    if missing:
+        raise ValueError(f"Locale '{name}' is missing templates for: {', '.join(missing)}")
+    TEMPLATES[name] = dict(templates)
+    with _text_lock:
+        _text_cache.clear()
+
+
+# Rules in priority order: (slot, rule, condition). The first matching rule of a slot wins.
+# Conditions read the columns from _columns / _row_columns and only use operators that work on
+# NumPy arrays and Python scalars alike, so one table serves batches and single rows.
+RULE_TABLE = (
+    # Strength: only when the home attack and away defence ratings are both known
+    ('strength', 'attack_home', lambda c: c['has_fpl'] & c['home_win'] & (c['h_att'] > c['a_def'] + STRENGTH_MARGIN)),
+    ('strength', 'attack_away', lambda c: c['has_fpl'] & c['not_home_win'] & (c['a_att'] > c['h_def'] + STRENGTH_MARGIN)),
+    ('confidence', 'draw', lambda c: c['draw']),
+    ('confidence', 'strong', lambda c: c['win_prob'] > STRONG_PROB),
+    ('confidence', 'edge', lambda c: c['win_prob'] > EDGE_PROB),
+    ('form', 'form_home', lambda c: c['home_win'] & (c['home_wins'] > c['away_wins'])),
+    ('form', 'form_away', lambda c: c['away_win'] & (c['away_wins'] > c['home_wins'])),
+    ('form', 'bounce_back', lambda c: c['home_win'] & (c['home_losses'] >= BOUNCE_BACK_LOSSES)),
+)
+# Rule used when no condition of the slot matches (none: the slot stays empty)
+SLOT_DEFAULTS = {'confidence': 'uncertain'}
+# Below this many rows, rules are evaluated row by row (NumPy call overhead dominates)
+VECTORIZE_MIN_ROWS = 32
+
+_SLOT_RULES = [
+    ([rule for rule_slot, rule, _ in RULE_TABLE if rule_slot == slot],
+     [condition for rule_slot, _, condition in RULE_TABLE if rule_slot == slot],
+     RULE_IDS[SLOT_DEFAULTS[slot]] if slot in SLOT_DEFAULTS else 0)
+    for slot in SLOTS
+]
+
+
+def _strength(m, field, default=None):
+    # Missing (or None) ratings become 0, which the rules treat like "no FPL data"
+    return m.get(field, default) or 0
+
+
+def _columns(fixtures, probs):
+    """
+    Rule inputs for a batch, as NumPy columns.
+    """
+    p_home, p_draw, p_away = probs[:, 0], probs[:, 1], probs[:, 2]
+    home_win = (p_home > p_away) & (p_home > p_draw)
+    away_win = ~home_win & (p_away > p_home) & (p_away > p_draw)
+    h_att = np.array([_strength(m, 'home_strength_attack') for m in fixtures], dtype=np.float64)
+    a_def = np.array([_strength(m, 'away_strength_defence') for m in fixtures], dtype=np.float64)
+    return {
+        'home_win': home_win,
+        'away_win': away_win,
+        'not_home_win': ~home_win,
+        'draw': ~home_win & ~away_win,
+        'win_prob': np.where(home_win, p_home, np.where(away_win, p_away, p_draw)),
+        'has_fpl': (h_att != 0) & (a_def != 0),
+        'h_att': h_att,
+        'a_def': a_def,
+        'a_att': np.array([_strength(m, 'away_strength_attack', 0) for m in fixtures], dtype=np.float64),
+        'h_def': np.array([_strength(m, 'home_strength_defence', 0) for m in fixtures], dtype=np.float64),
+        'home_wins': np.array([m['last_5_matches_home'].count('W') for m in fixtures], dtype=np.int64),
+        'away_wins': np.array([m['last_5_matches_away'].count('W') for m in fixtures], dtype=np.int64),
+        'home_losses': np.array([m['last_5_matches_home'].count('L') for m in fixtures], dtype=np.int64),
+    }
+
+
+def _row_columns(m, p_home, p_draw, p_away):
+    """
+    The same rule inputs for one fixture, as Python scalars.
+    """
+    home_win = p_home > p_away and p_home > p_draw
+    away_win = not home_win and p_away > p_home and p_away > p_draw
+    h_att = _strength(m, 'home_strength_attack')
+    a_def = _strength(m, 'away_strength_defence')
+    return {
+        'home_win': home_win,
+        'away_win': away_win,
+        'not_home_win': not home_win,
+        'draw': not home_win and not away_win,
+        'win_prob': p_home if home_win else p_away if away_win else p_draw,
+        'has_fpl': h_att != 0 and a_def != 0,
+        'h_att': h_att,
+        'a_def': a_def,
+        'a_att': _strength(m, 'away_strength_attack', 0),
+        'h_def': _strength(m, 'home_strength_defence', 0),
+        'home_wins': m['last_5_matches_home'].count('W'),
+        'away_wins': m['last_5_matches_away'].count('W'),
+        'home_losses': m['last_5_matches_home'].count('L'),
+    }
+
+
+def explain_codes(fixtures, probs):
+    """
+    Rule ids (see RULES) for every fixture, as an (n, 3) int8 matrix with one column per slot.
+    `probs` is an (n, 3) array of home / draw / away percentages, as in predict_matches.
+    """
+    probs = np.asarray(probs, dtype=np.float64).reshape(-1, 3)
+    if len(probs) < VECTORIZE_MIN_ROWS:
+        rows = []
+        for m, p in zip(fixtures, probs.tolist()):
+            c = _row_columns(m, *p)
+            rows.append([next((RULE_IDS[rule] for rule, condition in zip(rules, conditions) if condition(c)), default)
+                         for rules, conditions, default in _SLOT_RULES])
+        return np.array(rows, dtype=np.int8).reshape(-1, len(SLOTS))
+
+    codes = np.empty((len(probs), len(SLOTS)), dtype=np.int8)
+    c = _columns(fixtures, probs)
+    for slot, (rules, conditions, default) in enumerate(_SLOT_RULES):
+        codes[:, slot] = np.select([condition(c) for condition in conditions],
+                                   [RULE_IDS[rule] for rule in rules], default)
+    return codes
+
+
+def rule_names(codes):
+    """
+    Space-separated rule names for each row of explain_codes() output.
+    """
+    return [" ".join(RULES[c] for c in row if c) for row in codes.tolist()]
+
+
+def explain_batch(fixtures, probs, locale=None):
+    """
+    Explanation text for every fixture (same text as MatchPredictor.generate_explanation).
+    """
+    locale = locale or DEFAULT_LOCALE
+    templates = TEMPLATES[locale]
+    probs = np.asarray(probs, dtype=np.float64).reshape(-1, 3)
+    codes = explain_codes(fixtures, probs)
+    draw = RULE_IDS['draw']
+    attack_home = RULE_IDS['attack_home']
+
+    texts = []
+    cache = _text_cache
+    for m, row, (p_home, _, p_away) in zip(fixtures, codes.tolist(), probs.tolist()):
+        # 0: home favoured, 1: draw, 2: away favoured (the {winner} placeholder)
+        s = 1 if row[1] == draw else 0 if p_home > p_away else 2
+        home = m['home_team']
+        away = m['away_team']
+        # As text, so 1350 and 1350.0 stay distinct keys
+        rating = str(m.get('home_strength_attack')) if row[0] == attack_home else None
+        key = (locale, row[0], row[1], row[2], s, home, away, rating)
+        text = cache.get(key)
+        if text is None:
+            values = {'home': home, 'away': away, 'rating': rating,
+                      'winner': home if s == 0 else away if s == 2 else "Draw"}
+            text = " ".join(templates[RULES[c]].format_map(values) for c in row if c)
+            with _text_lock:
+                if len(cache) >= TEXT_CACHE_SIZE:
+                    cache.clear()
+                cache[key] = text
+        texts.append(text)
+    return texts
@@ -0,0 +1,143 @@
+"""
+Incremental feature pipeline: rolling form, goal difference, rest days and Elo ratings.
+
+FeatureState keeps O(1) state per team (fixed-length windows with running sums, the date
+of the last match and an Elo rating). Features for a match are always read *before* the
+match result is applied, so training rows never see their own outcome, and the very same
+features() call produces the live features for upcoming fixtures once history is loaded.
+New results are appended with update() without touching earlier matches.
+"""
+from collections import deque
+import numpy as np
+
+# Columns produced by FeatureState.features, in order
+FEATURE_COLUMNS = [
+    'HomeForm', 'AwayForm',        # points from the last `window` matches
+    'HomeGD', 'AwayGD',            # goal difference over the last `window` matches
+    'HomeRest', 'AwayRest',        # days since the previous match (capped)
+    'HomeElo', 'AwayElo', 'EloDiff'
+]
+# Written by train_model.py --features rich: {'state': FeatureState, 'rows': {csv file: feature rows}}
+FEATURE_STATE_PATH = 'feature_state.pkl'
+
+
+class _Rolling:
+    """
+    Fixed-length window with a running sum, so append and sum are O(1).
+    """
+
+    def __init__(self, size):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+
+    def append(self, value):
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+
+class FeatureState:
+    def __init__(self, window=5, k_factor=20.0, home_advantage=60.0, initial_elo=1500.0,
+                 default_rest=7.0, max_rest=30.0):
+        self.window = window
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.initial_elo = initial_elo
+        self.default_rest = default_rest
+        self.max_rest = max_rest
+        self.form = {}
+        self.goal_diff = {}
+        self.last_played = {}
+        self.elo = {}
+        self.last_date = None
+
+    def _rest(self, team, date):
+        last = self.last_played.get(team)
+        if last is None or date is None:
+            return self.default_rest
+        return float(min(max((date - last).days, 0), self.max_rest))
+
+    def features(self, home, away, date):
+        """
+        Pre-match features for home vs away on `date` (a Timestamp, or None if unknown).
+        """
+        home_elo = self.elo.get(home, self.initial_elo)
+        away_elo = self.elo.get(away, self.initial_elo)
+        return [
+            self.form[home].total if home in self.form else 0.0,
+            self.form[away].total if away in self.form else 0.0,
+            self.goal_diff[home].total if home in self.goal_diff else 0.0,
+            self.goal_diff[away].total if away in self.goal_diff else 0.0,
+            self._rest(home, date),
+            self._rest(away, date),
+            home_elo,
+            away_elo,
+            home_elo - away_elo
+        ]
+
+    def update(self, home, away, date, home_goals, away_goals):
+        """
+        Applies one finished match.
+        """
+        if home_goals > away_goals:
+            home_points, away_points, score = 3, 0, 1.0
+        elif home_goals < away_goals:
+            home_points, away_points, score = 0, 3, 0.0
+        else:
+            home_points, away_points, score = 1, 1, 0.5
+
+        for team, points, gd in ((home, home_points, home_goals - away_goals),
+                                 (away, away_points, away_goals - home_goals)):
+            if team not in self.form:
+                self.form[team] = _Rolling(self.window)
+                self.goal_diff[team] = _Rolling(self.window)
+            self.form[team].append(points)
+            self.goal_diff[team].append(gd)
+            if date is not None:
+                self.last_played[team] = date
+
+        home_elo = self.elo.get(home, self.initial_elo)
+        away_elo = self.elo.get(away, self.initial_elo)
+        expected = 1 / (1 + 10 ** ((away_elo - home_elo - self.home_advantage) / 400))
+        delta = self.k_factor * (score - expected)
+        self.elo[home] = home_elo + delta
+        self.elo[away] = away_elo - delta
+        if date is not None:
+            self.last_date = date if self.last_date is None else max(self.last_date, date)
+
+
+def parse_dates(dates):
+    """
+    football-data dates are day-first, with two- or four-digit years.
+    """
+    # Training-only: serving reads features from a saved state without loading pandas
+    import pandas as pd
+    return pd.to_datetime(dates, dayfirst=True, format='mixed', errors='coerce')
+
+
+def compute_features(matches, state=None):
+    """
+    Runs one chronological pass over `matches` (HomeTeam, AwayTeam, Date, FTHG, FTAG),
+    reading each match's features before applying its result.
+    Returns (float32 array aligned with the input rows, state). Pass an existing state to
+    append newer matches without reprocessing history.
+    """
+    state = state or FeatureState()
+    dates = parse_dates(matches['Date'])
+    order = np.argsort(dates.to_numpy(dtype='datetime64[ns]'), kind='stable')
+
+    import pandas as pd
+    homes = matches['HomeTeam'].astype(str).to_numpy()
+    aways = matches['AwayTeam'].astype(str).to_numpy()
+    home_goals = matches['FTHG'].to_numpy(dtype=np.float64)
+    away_goals = matches['FTAG'].to_numpy(dtype=np.float64)
+    # Plain datetimes, so a pickled state loads without pandas
+    dates = [None if pd.isna(d) else d.to_pydatetime() for d in dates]
+
+    out = np.empty((len(matches), len(FEATURE_COLUMNS)), dtype=np.float32)
+    for i in order:
+        out[i] = state.features(homes[i], aways[i], dates[i])
+        if not (np.isnan(home_goals[i]) or np.isnan(away_goals[i])):
+            state.update(homes[i], aways[i], dates[i], home_goals[i], away_goals[i])
+    return out, state
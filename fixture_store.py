@@ -0,0 +1,239 @@
+"""
+Columnar fixture store.
+
+Fixtures are held in one NumPy structured array (one field per fixture attribute) with
+id and "Home vs Away" label indexes. Iterating or indexing the store yields Fixture views:
+read-only mappings over a row of the array (no per-fixture dict is built), usable wherever
+a fixture dict is read (`f['home_team']`, `f.get('avg_odds_home', 2.5)`, `f.copy()`).
+The model's input columns come straight out of the array with model_columns().
+
+Fixtures load from JSON (a list, or {"fixtures": [...]}), JSONL, CSV or Parquet files.
+In CSV files, list fields hold JSON arrays, ";"-separated text, or form strings like "WLDWW".
+Odds and FPL strengths are parsed from text on load, and empty cells count as missing.
+"""
+import csv
+import json
+import math
+import os
+from collections.abc import Mapping
+import numpy as np
+
+# Float columns; NaN marks a missing value. Other scalar columns keep their Python values (None if missing).
+FLOAT_COLUMNS = ('avg_odds_home', 'avg_odds_draw', 'avg_odds_away')
+# List columns (stored as Python lists)
+LIST_COLUMNS = ('home_injuries', 'away_injuries', 'last_5_matches_home', 'last_5_matches_away')
+FORM_COLUMNS = ('last_5_matches_home', 'last_5_matches_away')
+# Numeric columns kept as Python numbers (FPL strength tiers and ratings): text from CSV files is
+# parsed on load, whole numbers become int, missing values None
+NUMBER_COLUMNS = tuple(f'{side}_strength{metric}' for side in ('home', 'away')
+                       for metric in ('', '_attack', '_defence', '_overall'))
+# Model input defaults, as in MatchPredictor.predict_matches
+ODDS_DEFAULTS = {'avg_odds_home': 2.0, 'avg_odds_draw': 3.0, 'avg_odds_away': 3.0}
+
+
+def _is_missing(value):
+    # Empty CSV cells count as missing too
+    return (value is None or (isinstance(value, float) and math.isnan(value))
+            or (isinstance(value, str) and not value.strip()))
+
+
+def _parse_number(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _parse_list(value, form=False):
+    """
+    List field from a file: a list already, a JSON array, "a;b" text or (form) "WLDWW".
+    """
+    if _is_missing(value):
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            return list(json.loads(text))
+        if form:
+            return [c for c in text if c in 'WDL']
+        return [part.strip() for part in text.split(';') if part.strip()]
+    return list(value)
+
+
+def parse_field(name, value):
+    """
+    One fixture field as read from a file, converted to its Python value: float odds, numeric
+    strengths, lists for list columns ([] if missing). Other missing values become None.
+    """
+    if name in LIST_COLUMNS:
+        return _parse_list(value, name in FORM_COLUMNS)
+    if _is_missing(value):
+        return None
+    if name in FLOAT_COLUMNS:
+        return float(value)
+    if name in NUMBER_COLUMNS:
+        return _parse_number(value)
+    return value
+
+
+def parse_record(record):
+    """
+    A fixture dict with every field converted by parse_field and missing fields left out,
+    so `fixture.get(field, default)` sees the default. Form lists are always present.
+    """
+    fixture = {}
+    for name, value in record.items():
+        value = parse_field(name, value)
+        if value is not None:
+            fixture[name] = value
+    for name in FORM_COLUMNS:
+        fixture.setdefault(name, [])
+    return fixture
+
+
+class Fixture(Mapping):
+    """
+    Read-only view of one fixture row. Missing values (NaN / None) behave like absent keys.
+    """
+    __slots__ = ('_record', '_names')
+
+    def __init__(self, record, names):
+        self._record = record
+        self._names = names
+
+    def __getitem__(self, key):
+        try:
+            value = self._record[key]
+        except (ValueError, KeyError, IndexError):
+            raise KeyError(key) from None
+        if isinstance(value, np.generic):
+            value = value.item()
+        if _is_missing(value):
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return (name for name in self._names if not _is_missing(self._record[name]))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        """
+        A plain, mutable dict of this fixture.
+        """
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"Fixture({self.copy()!r})"
+
+
+class FixtureStore:
+    def __init__(self, records):
+        records = list(records)
+        names = ['id', 'home_team', 'away_team']
+        for record in records:
+            names += [k for k in record if k not in names]
+        # The predictor and explanations always read the form lists
+        names += [name for name in FORM_COLUMNS if name not in names]
+
+        dtype = [(name, 'f8' if name in FLOAT_COLUMNS else 'i8' if name == 'id' else 'O') for name in names]
+        self.data = np.empty(len(records), dtype=dtype)
+        for name in names:
+            if name == 'id':
+                self.data[name] = [int(r['id']) if not _is_missing(r.get('id')) else i + 1
+                                   for i, r in enumerate(records)]
+                continue
+            values = [parse_field(name, r.get(name)) for r in records]
+            if name in FLOAT_COLUMNS:
+                self.data[name] = [np.nan if v is None else v for v in values]
+            elif name in LIST_COLUMNS:
+                column = np.empty(len(records), dtype=object)
+                column[:] = values
+                self.data[name] = column
+            else:
+                self.data[name] = values
+        self.names = tuple(names)
+        self._build_index()
+
+    def _build_index(self):
+        self.labels = [f"{h} vs {a}" for h, a in zip(self.data['home_team'], self.data['away_team'])]
+        self.label_index = {label: row for row, label in enumerate(self.labels)}
+        self.id_index = {int(i): row for row, i in enumerate(self.data['id'])}
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, row):
+        return Fixture(self.data[row], self.names)
+
+    def __iter__(self):
+        return (Fixture(record, self.names) for record in self.data)
+
+    def by_label(self, label):
+        return self[self.label_index[label]]
+
+    def by_id(self, fixture_id):
+        return self[self.id_index[fixture_id]]
+
+    def column(self, name):
+        """
+        The whole column as an array (a view into the store).
+        """
+        return self.data[name]
+
+    def set_column(self, name, values):
+        """
+        Adds or overwrites a column, e.g. enrichment data for every fixture at once.
+        """
+        if name in FLOAT_COLUMNS:
+            values = np.asarray(values, dtype='f8')
+        else:
+            # Filled element-wise so equal-length lists stay list objects
+            column = np.empty(len(self.data), dtype=object)
+            column[:] = list(values)
+            values = column
+        if name not in self.names:
+            dtype = self.data.dtype.descr + [(name, 'f8' if name in FLOAT_COLUMNS else 'O')]
+            data = np.empty(len(self.data), dtype=dtype)
+            for existing in self.names:
+                data[existing] = self.data[existing]
+            self.data = data
+            self.names = self.names + (name,)
+        self.data[name] = values
+
+    def model_columns(self):
+        """
+        Model inputs for every fixture: (home team names, away team names, odds as an (n, 3) array).
+        Missing odds get the predictor's defaults.
+        """
+        odds = np.empty((len(self), len(ODDS_DEFAULTS)))
+        for col, (name, default) in enumerate(ODDS_DEFAULTS.items()):
+            odds[:, col] = np.nan_to_num(self.data[name], nan=default) if name in self.names else default
+        return self.data['home_team'], self.data['away_team'], odds
+
+    def to_records(self):
+        return [f.copy() for f in self]
+
+
+def load_fixtures(path):
+    """
+    Loads a FixtureStore from a .json, .jsonl, .csv or .parquet file.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        records = data['fixtures'] if isinstance(data, dict) else data
+    elif ext == '.jsonl':
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    elif ext == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            records = list(csv.DictReader(f))
+    elif ext == '.parquet':
+        import pandas as pd
+        records = pd.read_parquet(path).to_dict('records')
+    else:
+        raise ValueError(f"Unsupported fixture file type: {path}")
+    return FixtureStore(records)
@@ -0,0 +1,258 @@
+"""
+Opt-in timings, counters and per-request profiling for the hot paths.
+
+Everything is off unless enabled through the environment, and the disabled paths are
+no-ops: timed() returns the function unchanged, span() returns a shared null context and
+count() returns immediately.
+
+    FP_METRICS=1                    record timings / counters
+    FP_METRICS_LOG_INTERVAL=60      also print a one-line summary every 60 s (stderr)
+    FP_METRICS_PORT=9100            also serve Prometheus text on http://127.0.0.1:9100/metrics
+    FP_PROFILE=profiles/            write one profile per request / app rerun to this directory
+    FP_PROFILER=pyinstrument        use pyinstrument (HTML) instead of cProfile (.prof)
+"""
+import contextlib
+import functools
+import os
+import sys
+import threading
+import time
+
+ENABLED = os.environ.get("FP_METRICS", "").lower() in ("1", "true", "yes")
+LOG_INTERVAL = float(os.environ.get("FP_METRICS_LOG_INTERVAL", 0))
+METRICS_PORT = int(os.environ.get("FP_METRICS_PORT", 0))
+PROFILE_DIR = os.environ.get("FP_PROFILE") or None
+PROFILER = os.environ.get("FP_PROFILER", "cprofile").lower()
+# Metric name prefix in the Prometheus output
+PROMETHEUS_PREFIX = "football_predictor"
+
+_lock = threading.Lock()
+_timings = {}   # name -> [count, total seconds, max seconds]
+_counters = {}  # name -> count
+_started = False
+_NULL = contextlib.nullcontext()
+
+
+def observe(name, seconds):
+    with _lock:
+        stat = _timings.get(name)
+        if stat is None:
+            _timings[name] = [1, seconds, seconds]
+        else:
+            stat[0] += 1
+            stat[1] += seconds
+            if seconds > stat[2]:
+                stat[2] = seconds
+
+
+def count(name, n=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+@contextlib.contextmanager
+def _span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+
+def span(name):
+    """
+    Times a block: `with span('predict.predict_proba'): ...`
+    """
+    return _span(name) if ENABLED else _NULL
+
+
+def timed(name):
+    """
+    Decorator timing every call. Decided at import time: without FP_METRICS the function is returned as is.
+    """
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """
+    Copy of the current timings and counters.
+    """
+    with _lock:
+        return {
+            "timings": {
+                name: {"count": c, "total_s": round(total, 6), "max_s": round(mx, 6)}
+                for name, (c, total, mx) in _timings.items()
+            },
+            "counters": dict(_counters)
+        }
+
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+
+def prometheus_text():
+    """
+    Timings as a summary (_count / _sum) plus a max gauge; counters as *_total.
+    """
+    data = snapshot()
+    p = PROMETHEUS_PREFIX
+    lines = [
+        f"# TYPE {p}_duration_seconds summary",
+    ]
+    for name, t in sorted(data["timings"].items()):
+        lines.append(f'{p}_duration_seconds_count{{op="{name}"}} {t["count"]}')
+        lines.append(f'{p}_duration_seconds_sum{{op="{name}"}} {t["total_s"]}')
+    lines.append(f"# TYPE {p}_duration_seconds_max gauge")
+    for name, t in sorted(data["timings"].items()):
+        lines.append(f'{p}_duration_seconds_max{{op="{name}"}} {t["max_s"]}')
+    lines.append(f"# TYPE {p}_events_total counter")
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f'{p}_events_total{{event="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def summary_line():
+    """
+    One-line human summary: op count/avg/max and the counters.
+    """
+    data = snapshot()
+    parts = [
+        f"{name} n={t['count']} avg={t['total_s'] / t['count'] * 1000:.2f}ms max={t['max_s'] * 1000:.2f}ms"
+        for name, t in sorted(data["timings"].items())
+    ]
+    parts += [f"{name}={value}" for name, value in sorted(data["counters"].items())]
+    return "[metrics] " + " | ".join(parts)
+
+
+def _metrics_handler():
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def _log_forever(interval):
+    while True:
+        time.sleep(interval)
+        print(summary_line(), file=sys.stderr)
+
+
+def start():
+    """
+    Starts the periodic log line and / or the Prometheus endpoint if configured.
+    Safe to call on every Streamlit rerun: only the first call starts anything.
+    """
+    global _started
+    if not ENABLED:
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    if LOG_INTERVAL > 0:
+        threading.Thread(target=_log_forever, args=(LOG_INTERVAL,), daemon=True).start()
+    if METRICS_PORT:
+        from http.server import ThreadingHTTPServer
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", METRICS_PORT), _metrics_handler())
+        except OSError as e:
+            # Another process (e.g. a second service worker) already serves the port
+            print(f"Metrics endpoint not started on port {METRICS_PORT}: {e}")
+            return
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+class _Capture:
+    """
+    One profile written to PROFILE_DIR when stopped. Usable as a context manager.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.profiler = None
+
+    def start(self):
+        if PROFILER == "pyinstrument":
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+            self.profiler.start()
+        else:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler is None:
+            return
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stem = os.path.join(PROFILE_DIR, f"{self.name}-{time.time_ns()}")
+        if PROFILER == "pyinstrument":
+            self.profiler.stop()
+            with open(f"{stem}.html", "w", encoding="utf-8") as f:
+                f.write(self.profiler.output_html())
+        else:
+            self.profiler.disable()
+            self.profiler.dump_stats(f"{stem}.prof")
+        self.profiler = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _NullCapture:
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_CAPTURE = _NullCapture()
+
+
+def profile(name):
+    """
+    Per-request profile capture when FP_PROFILE is set; a no-op otherwise.
+    """
+    return _Capture(name) if PROFILE_DIR else _NULL_CAPTURE
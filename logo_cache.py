@@ -0,0 +1,178 @@
+"""
+Team logo cache for the app.
+
+Local logos are downscaled to the display size and base64-encoded once, then memoized by
+(path, mtime), so a rerun costs a dict lookup instead of a disk read. Remote crests are
+downloaded ahead of time (`python logo_cache.py`) into a content-addressed store
+(assets/crests/<sha1>.png plus an index from URL to file) and served from there; URLs missing
+from the store are still hot-linked as before.
+
+Downscaling uses Pillow (listed in requirements-serve.txt); without it downscaling is skipped
+and images are served as they are.
+
+Usage:
+    python logo_cache.py                 # prefetch the crests used by data_loader fixtures
+    python logo_cache.py URL [URL ...]
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from urllib.parse import urlparse
+
+# Rendered <img> width in the app
+LOGO_SIZE = 100
+CREST_STORE_DIR = os.path.join("assets", "crests")
+CREST_INDEX_PATH = os.path.join(CREST_STORE_DIR, "index.json")
+PLACEHOLDER_LOGO = "https://via.placeholder.com/100?text=Logo"
+# Wikimedia rejects requests without a descriptive User-Agent
+USER_AGENT = "Football-Predictor/1.0 (crest prefetch)"
+
+_lock = threading.Lock()
+_encoded = {}  # (path, mtime_ns) -> data URI
+_index = None
+_index_stat = None
+
+
+def downscale(data, size=LOGO_SIZE):
+    """
+    Returns PNG bytes of the image fitted into size x size (aspect kept), or `data` unchanged
+    if Pillow is not installed or the image is already small enough.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+    with Image.open(io.BytesIO(data)) as img:
+        if max(img.size) <= size:
+            return data
+        img = img.convert("RGBA")
+        img.thumbnail((size, size), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+
+
+def _data_uri(data, path):
+    mime = "image/svg+xml" if path.endswith(".svg") else "image/png"
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+
+def _encode_file(path):
+    """
+    Data URI of the downscaled local file, memoized until the file's mtime changes.
+    """
+    key = (path, os.stat(path).st_mtime_ns)
+    uri = _encoded.get(key)
+    if uri is None:
+        with open(path, "rb") as f:
+            data = f.read()
+        if not path.endswith(".svg"):
+            data = downscale(data)
+        uri = _data_uri(data, path)
+        with _lock:
+            # Drop the entry for an older version of the same file
+            for old in [k for k in _encoded if k[0] == path]:
+                del _encoded[old]
+            _encoded[key] = uri
+    return uri
+
+
+def _load_index():
+    """
+    URL -> stored crest filename, re-read when the index file changes.
+    """
+    global _index, _index_stat
+    try:
+        st = os.stat(CREST_INDEX_PATH)
+    except FileNotFoundError:
+        return {}
+    stat = (st.st_mtime_ns, st.st_size)
+    if stat != _index_stat:
+        with open(CREST_INDEX_PATH, encoding="utf-8") as f:
+            _index = json.load(f)
+        _index_stat = stat
+    return _index
+
+
+def logo_src(path_or_url):
+    """
+    `src` for an <img>: an inline data URI for local files and prefetched crests,
+    the original URL for crests that were never prefetched.
+    """
+    if path_or_url.startswith(("http://", "https://")):
+        stored = _load_index().get(path_or_url)
+        if stored is None:
+            return path_or_url
+        try:
+            return _encode_file(os.path.join(CREST_STORE_DIR, stored))
+        except OSError:
+            return path_or_url
+    try:
+        return _encode_file(path_or_url)
+    except OSError:
+        # Fallback if file not found
+        return PLACEHOLDER_LOGO
+
+
+def _is_svg(url, response):
+    content_type = response.headers.get("Content-Type", "")
+    return urlparse(url).path.endswith(".svg") or content_type.startswith("image/svg+xml")
+
+
+def prefetch(urls, timeout=10):
+    """
+    Downloads each URL, downscales it and stores it by content hash. Returns the number stored.
+    SVG crests (vector, so already resolution-independent) are stored unchanged.
+    Crests already in the index are skipped; failures are reported and skipped.
+    """
+    import requests
+
+    os.makedirs(CREST_STORE_DIR, exist_ok=True)
+    index = dict(_load_index())
+    stored = 0
+    with requests.Session() as session:
+        session.headers["User-Agent"] = USER_AGENT
+        for url in dict.fromkeys(urls):
+            if url in index and os.path.exists(os.path.join(CREST_STORE_DIR, index[url])):
+                continue
+            try:
+                response = session.get(url, timeout=timeout)
+                response.raise_for_status()
+                svg = _is_svg(url, response)
+                data = response.content if svg else downscale(response.content)
+            except Exception as e:
+                print(f"Could not fetch crest {url}: {e}")
+                continue
+            ext = ".svg" if svg else ".png"
+            name = hashlib.sha1(data).hexdigest() + ext
+            with open(os.path.join(CREST_STORE_DIR, name), "wb") as f:
+                f.write(data)
+            index[url] = name
+            stored += 1
+
+    tmp_path = f"{CREST_INDEX_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, CREST_INDEX_PATH)
+    return stored
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prefetch remote team crests into the local store.")
+    parser.add_argument('urls', nargs='*', help="Crest URLs (default: every remote logo in the current fixtures)")
+    args = parser.parse_args()
+
+    urls = args.urls
+    if not urls:
+        from data_loader import get_current_fixtures
+        urls = [
+            f[field] for f in get_current_fixtures()
+            for field in ('home_team_logo', 'away_team_logo')
+            if f.get(field, '').startswith(("http://", "https://"))
+        ]
+    n = prefetch(urls)
+    print(f"Stored {n} new crest(s) in {CREST_STORE_DIR} ({len(_load_index())} indexed).")
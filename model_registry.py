@@ -0,0 +1,133 @@
+"""
+Process-wide registry for model artifacts.
+
+Streamlit re-executes app.py on every interaction, but imported modules stay in sys.modules,
+so artifacts held here are loaded once per process and shared by every session and rerun.
+An artifact is reloaded only when its file changes: a cheap (mtime, size) check on every
+access, confirmed by a content hash so a plain `touch` does not trigger a reload.
+
+Array directories (one `.npy` file per array, like the compact model) are opened with
+np.load(mmap_mode='r'): the arrays are memory-mapped, so they are paged in on first use and
+shared through the page cache by every worker process on the host.
+`.json` artifacts are returned as parsed JSON, anything else is unpickled.
+"""
+import hashlib
+import json
+import os
+import pickle
+import threading
+from concurrent.futures import Future
+
+_lock = threading.RLock()
+_artifacts = {}  # path -> {'stat': (mtime_ns, size), 'hash': str, 'obj': object}
+_predictor = None
+_preload = None  # Future of the background get_predictor() call
+
+
+def _array_files(path):
+    return sorted(name for name in os.listdir(path) if name.endswith('.npy'))
+
+
+def _file_stat(path):
+    if os.path.isdir(path):
+        stats = []
+        for name in _array_files(path):
+            st = os.stat(os.path.join(path, name))
+            stats.append((name, st.st_mtime_ns, st.st_size))
+        return tuple(stats)
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    files = [os.path.join(path, name) for name in _array_files(path)] if os.path.isdir(path) else [path]
+    for file in files:
+        h.update(os.path.basename(file).encode())
+        with open(file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def _load(path):
+    if os.path.isdir(path):
+        import numpy as np
+        return {name[:-4]: np.load(os.path.join(path, name), mmap_mode='r') for name in _array_files(path)}
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def load_artifact(path):
+    """
+    Returns the object stored at `path`, reusing the cached copy while the file is unchanged.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    stat = _file_stat(path)
+    with _lock:
+        entry = _artifacts.get(path)
+        if entry and entry['stat'] == stat:
+            return entry['obj']
+        digest = _file_hash(path)
+        if entry and entry['hash'] == digest:
+            entry['stat'] = stat
+            return entry['obj']
+        obj = _load(path)
+        _artifacts[path] = {'stat': stat, 'hash': digest, 'obj': obj}
+        return obj
+
+
+def artifact_hash(path):
+    """
+    Content hash of the currently loaded artifact, or None if it was never loaded.
+    """
+    entry = _artifacts.get(path)
+    return entry['hash'] if entry else None
+
+
+def get_predictor():
+    """
+    Returns the shared MatchPredictor, reloading its artifacts if they changed on disk.
+    """
+    global _predictor
+    with _lock:
+        if _predictor is None:
+            from predictor import MatchPredictor
+            _predictor = MatchPredictor()
+        else:
+            _predictor.reload_if_changed()
+        return _predictor
+
+
+def preload_predictor():
+    """
+    Starts building the shared predictor in a background thread and returns a Future for it.
+    Lets a UI render while the model loads; later calls return the same Future.
+    """
+    global _preload
+    with _lock:
+        if _preload is None or (_preload.done() and _preload.exception() is not None):
+            _preload = Future()
+            threading.Thread(target=_run_preload, args=(_preload,), daemon=True).start()
+        return _preload
+
+
+def _run_preload(future):
+    try:
+        future.set_result(get_predictor())
+    except Exception as e:
+        future.set_exception(e)
+
+
+def clear():
+    """
+    Drops every cached artifact and the shared predictor.
+    """
+    global _predictor, _preload
+    with _lock:
+        _artifacts.clear()
+        _predictor = None
+        _preload = None
@@ -1,62 +1,295 @@
-import pickle
-import pandas as pd
+import difflib
 import numpy as np
 import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import instrumentation
+import model_registry
+from calibration import CALIBRATION_PATH, Calibrator
+from explanations import DEFAULT_LOCALE, explain_batch, explain_codes, rule_names
+from features import FEATURE_COLUMNS, FEATURE_STATE_PATH, FeatureState
+from fixture_store import FixtureStore, _is_missing
+from team_names import CSV_ALIASES, FPL_ALIASES, normalize, to_csv_name
+
+# Model input columns, in the order used by train_model.py
+FEATURES = ['HomeTeam_Code', 'AwayTeam_Code', 'AvgH', 'AvgD', 'AvgA']
+
+MODEL_PATH = 'football_model.pkl'
+ENCODER_PATH = 'encoder.pkl'
+# Flattened forest written by train_model.export_compact: a directory of .npy arrays that the
+# registry memory-maps. Preferred over the pickle (no sklearn needed)
+COMPACT_MODEL_PATH = 'football_model_arrays'
+# Walk-forward backtest results written by backtest.py (shown in the app)
+METRICS_PATH = 'metrics.json'
+
+# Prediction cache capacity (entries); odds are rounded to this many decimals in cache keys
+PREDICTION_CACHE_SIZE = 4096
+ODDS_KEY_DECIMALS = 4
+# Team names resolved by the fuzzy fallback (matches and misses) kept per predictor; client input
+# reaches it through service.py, so the least recently used names are dropped past this size
+FUZZY_CACHE_SIZE = 1024
+# FPL strength fields read by generate_explanation
+EXPLANATION_FIELDS = ('home_strength_attack', 'home_strength_defence', 'away_strength_attack', 'away_strength_defence')
+
+
+class CompactForest:
+    """
+    Random forest flattened by train_model.export_compact, evaluated with vectorized NumPy.
+    Every tree advances one level per step for the whole batch, so the Python loop runs
+    at most max_depth times whatever the batch or forest size.
+    """
+
+    def __init__(self, arrays):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.children_left = arrays['children_left']
+        self.children_right = arrays['children_right']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.max_depth = int(arrays['max_depth'])
+        self.classes_ = arrays['classes']
+
+    def predict_proba(self, X):
+        # Compare in float32, exactly like sklearn's tree traversal
+        X = np.asarray(X, dtype=np.float32)
+        n_samples, n_features = X.shape
+        n_trees = len(self.roots)
+        X_flat = X.ravel()
+
+        # One cursor per (tree, sample) pair, tree-major; only cursors not yet at a leaf advance
+        node = np.repeat(self.roots, n_samples)
+        row_offset = np.tile(np.arange(n_samples) * n_features, n_trees)
+        active = np.arange(node.size)
+        for _ in range(self.max_depth):
+            current = node[active]
+            left = self.children_left[current]
+            # Leaves point to themselves
+            inner = left != current
+            active = active[inner]
+            if active.size == 0:
+                break
+            current = current[inner]
+            go_left = X_flat[row_offset[active] + self.feature[current]] <= self.threshold[current]
+            node[active] = np.where(go_left, left[inner], self.children_right[current])
+
+        per_tree = self.value[node].reshape(n_trees, n_samples, -1)
+        return per_tree.mean(axis=0, dtype=np.float64)
+
+
+class TeamCodes:
+    """
+    Team list shipped inside the compact model; stands in for the pickled encoder (code = position).
+    """
+
+    def __init__(self, teams):
+        self.classes_ = teams
+
 
 class MatchPredictor:
-    def __init__(self):
+    def __init__(self, cache_size=PREDICTION_CACHE_SIZE, cache_ttl=None, locale=None):
         self.model = None
         self.encoder = None
+        self.team_index = {}
+        self._artifacts = {}
+        self.feature_names = FEATURES
+        self.uses_match_features = False
+        self.feature_state = None
+        self.serving_version = None
+        self.calibrator = None
+        # Language of the explanation text (see explanations.TEMPLATES)
+        self.locale = locale or DEFAULT_LOCALE
+        # LRU prediction cache: key -> (expires_at, result); emptied whenever the model changes
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._fuzzy_lock = threading.Lock()
         self.load_model()
 
+    def _artifact_paths(self):
+        # The compact model carries its own team list
+        if os.path.exists(COMPACT_MODEL_PATH):
+            paths = [COMPACT_MODEL_PATH]
+        else:
+            paths = [MODEL_PATH, ENCODER_PATH]
+        # Team history for rich-feature models (train_model.py --features rich)
+        if os.path.exists(FEATURE_STATE_PATH):
+            paths.append(FEATURE_STATE_PATH)
+        # Probability calibrator fitted by train_model.py (calibration.py)
+        if os.path.exists(CALIBRATION_PATH):
+            paths.append(CALIBRATION_PATH)
+        return tuple(paths)
+
+    def _read_artifacts(self):
+        # Through the registry: returns the cached objects unless the files changed
+        return {path: model_registry.load_artifact(path) for path in self._artifact_paths()}
+
+    def _set_artifacts(self, artifacts):
+        if COMPACT_MODEL_PATH in artifacts:
+            arrays = artifacts[COMPACT_MODEL_PATH]
+            self.model = CompactForest(arrays)
+            self.encoder = TeamCodes(arrays['teams'])
+            self.feature_names = [str(name) for name in arrays['features']]
+        else:
+            self.model = artifacts[MODEL_PATH]
+            self.encoder = artifacts[ENCODER_PATH]
+            self.feature_names = [str(name) for name in getattr(self.model, 'feature_names_in_', FEATURES)]
+
+        # Rich models take the live FEATURE_COLUMNS after the team codes and odds
+        self.uses_match_features = self.feature_names == FEATURES + FEATURE_COLUMNS
+        self.feature_state = None
+        if self.uses_match_features:
+            if FEATURE_STATE_PATH in artifacts:
+                self.feature_state = artifacts[FEATURE_STATE_PATH]['state']
+            else:
+                print(f"Warning: {FEATURE_STATE_PATH} not found. Using default form/Elo features.")
+                self.feature_state = FeatureState()
+        elif self.feature_names != FEATURES:
+            raise ValueError(f"Unsupported model features: {self.feature_names}")
+
+        self.calibrator = None
+        if CALIBRATION_PATH in artifacts:
+            self.calibrator = Calibrator.from_dict(artifacts[CALIBRATION_PATH])
+
+        self._artifacts = artifacts
+        self.clear_cache()
+        # Content hash of every loaded artifact, calibrator included: identifies the probabilities
+        # served, so caches of predictions (scenarios.py) are keyed on it
+        self.serving_version = "-".join(model_registry.artifact_hash(path) for path in artifacts)
+        self._build_team_index()
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    def cache_info(self):
+        """
+        Prediction cache counters: hits, misses, current size and capacity.
+        """
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "maxsize": self.cache_size
+        }
+
+    def _cache_key(self, match_data, home_code, away_code, explain):
+        # Everything predict_matches and generate_explanation read from the fixture
+        return (
+            home_code,
+            away_code,
+            round(match_data.get('avg_odds_home', 2.0), ODDS_KEY_DECIMALS),
+            round(match_data.get('avg_odds_draw', 3.0), ODDS_KEY_DECIMALS),
+            round(match_data.get('avg_odds_away', 3.0), ODDS_KEY_DECIMALS),
+            match_data['home_team'],
+            match_data['away_team'],
+            match_data.get('match_time') if self.uses_match_features else None,
+            tuple(match_data['last_5_matches_home']) if explain else None,
+            tuple(match_data['last_5_matches_away']) if explain else None,
+            tuple(match_data.get(field) for field in EXPLANATION_FIELDS) if explain else None,
+            explain,
+            self.locale if explain else None
+        )
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._cache[key]
+            self.cache_misses += 1
+            return None
+
+    def _cache_put(self, key, result):
+        if not self.cache_size:
+            return
+        expires_at = time.monotonic() + self.cache_ttl if self.cache_ttl else None
+        with self._cache_lock:
+            self._cache[key] = (expires_at, dict(result))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @instrumentation.timed('load_model')
     def load_model(self):
         try:
-            with open('football_model.pkl', 'rb') as f:
-                self.model = pickle.load(f)
-            with open('encoder.pkl', 'rb') as f:
-                self.encoder = pickle.load(f)
+            self._set_artifacts(self._read_artifacts())
             print("Model and Encoder loaded successfully.")
         except FileNotFoundError:
             print("Model files not found. Please run train_model.py first.")
+        except ImportError as e:
+            # Serving installs (requirements-serve.txt) have no scikit-learn to unpickle the forest
+            print(f"Cannot load {MODEL_PATH} ({e}). Serve {COMPACT_MODEL_PATH}/, exported by train_model.py.")
+
+    def reload_if_changed(self):
+        """
+        Picks up retrained artifacts. Cheap when nothing changed (the registry only stats the files).
+        """
+        try:
+            artifacts = self._read_artifacts()
+        except FileNotFoundError:
+            return
+        if artifacts.keys() != self._artifacts.keys() or any(a is not self._artifacts[p] for p, a in artifacts.items()):
+            self._set_artifacts(artifacts)
+            print("Model and Encoder reloaded.")
+
+    def _build_team_index(self):
+        """
+        Builds the name -> code index once per loaded encoder.
+        Covers the CSV names the encoder was fitted on plus every known fixture / FPL alias.
+        """
+        self.team_index = {str(name): code for code, name in enumerate(self.encoder.classes_)}
+        for alias in list(CSV_ALIASES) + list(FPL_ALIASES):
+            csv_name = to_csv_name(alias)
+            if csv_name in self.team_index:
+                self.team_index.setdefault(alias, self.team_index[csv_name])
+        # Normalized keys for the fuzzy fallback
+        self._normalized_index = {}
+        for name, code in self.team_index.items():
+            self._normalized_index.setdefault(normalize(name), code)
+        self._fuzzy_cache = OrderedDict()
 
     def get_team_code(self, team_name):
         if not self.encoder:
             return None
-        
-        try:
-            return self.encoder.transform([team_name])[0]
-        except ValueError:
-            # Handle mismatch (e.g., "Man Utd" vs "Manchester United")
-            # Simple heuristic fallback or try to find close match
-            # For now, let's try some common mappings
-            mappings = {
-                "Manchester United": "Man United",
-                "Manchester City": "Man City",
-                "Tottenham": "Tottenham",
-                "West Ham": "West Ham",
-                "Nottingham Forest": "Nott'm Forest",
-                "Luton Town": "Luton",
-                "Sheffield United": "Sheffield United",
-                "Wolverhampton Wanderers": "Wolves",
-                "Brighton": "Brighton",
-                "Newcastle United": "Newcastle",
-                "Bournemouth": "Bournemouth",
-                "Brentford": "Brentford",
-                "Crystal Palace": "Crystal Palace",
-                "Fulham": "Fulham",
-                "Aston Villa": "Aston Villa",
-                "Everton": "Everton"
-            }
-            if team_name in mappings:
-                try:
-                    return self.encoder.transform([mappings[team_name]])[0]
-                except ValueError:
-                    pass
-            
-            # If still fails, try to find substrings?
-            # Creating a dummy code or handling gracefully
+
+        code = self.team_index.get(team_name)
+        if code is not None:
+            instrumentation.count('team_code_hit')
+            return code
+        with self._fuzzy_lock:
+            if team_name in self._fuzzy_cache:
+                self._fuzzy_cache.move_to_end(team_name)
+                instrumentation.count('team_code_fuzzy_cached')
+                return self._fuzzy_cache[team_name]
+
+        # Handle mismatch (e.g., "Man Utd FC" vs "Man United") on normalized names
+        with instrumentation.span('get_team_code.fuzzy'):
+            key = normalize(team_name)
+            code = self._normalized_index.get(key)
+            if code is None:
+                close = difflib.get_close_matches(key, list(self._normalized_index), n=1, cutoff=0.85)
+                if close:
+                    code = self._normalized_index[close[0]]
+
+        if code is None:
+            instrumentation.count('team_code_miss')
             print(f"Warning: Team '{team_name}' not found in encoder.")
-            return None
+        else:
+            instrumentation.count('team_code_fallback')
+        with self._fuzzy_lock:
+            self._fuzzy_cache[team_name] = code
+            while len(self._fuzzy_cache) > FUZZY_CACHE_SIZE:
+                self._fuzzy_cache.popitem(last=False)
+        return code
 
     def predict_match(self, match_data):
         """
@@ -64,128 +297,210 @@ class MatchPredictor:
         Input: match_data dict
         Output: Probabilities and reasoning.
         """
+        return self.predict_matches([match_data])[0]
+
+    def predict_matches(self, fixtures, explain=True):
+        """
+        Predicts a batch of fixtures with a single model call.
+        Input: list of match_data dicts, or a FixtureStore (read column-wise through model_columns())
+        Output: list of prediction dicts (same shape as predict_match), in input order.
+        explain='codes' puts compact rule names in "reasoning" instead of text (see explanations.py).
+        """
         if not self.model or not self.encoder:
-            return {
+            return [{
                 "home_win_prob": 33.3,
                 "draw_prob": 33.3,
                 "away_win_prob": 33.3,
                 "reasoning": "Model not loaded. Using equal probabilities."
+            } for _ in fixtures]
+
+        if isinstance(fixtures, FixtureStore):
+            results, X, row_index, row_keys = self._store_inputs(fixtures, explain)
+        else:
+            results, X, row_index, row_keys = self._dict_inputs(fixtures, explain)
+        if not row_index:
+            return results
+
+        with instrumentation.span('predict.build_input'):
+            model = self.model
+            if not isinstance(model, CompactForest):
+                # sklearn models were fitted with feature names; pandas is already loaded with sklearn
+                import pandas as pd
+                X = pd.DataFrame(X, columns=self.feature_names)
+        with instrumentation.span('predict.predict_proba'):
+            probs = model.predict_proba(X)
+        instrumentation.count('predicted_rows', len(row_index))
+
+        # Map probability columns to outcomes: FTR is 0(A), 1(D), 2(H)
+        classes = list(model.classes_)
+        outcome_probs = np.zeros((len(row_index), 3))
+        for col, cls in enumerate(classes):
+            outcome_probs[:, int(cls)] = probs[:, col]
+        if self.calibrator is not None:
+            outcome_probs = self.calibrator.transform(outcome_probs)
+
+        # Convert to percentage: home / draw / away columns
+        percentages = [[round(p * 100, 1) for p in row[::-1]] for row in outcome_probs.tolist()]
+
+        if explain == 'codes':
+            explanations = rule_names(explain_codes([fixtures[i] for i in row_index], percentages))
+        elif explain:
+            with instrumentation.span('generate_explanation'):
+                explanations = explain_batch([fixtures[i] for i in row_index], percentages, self.locale)
+        else:
+            explanations = [""] * len(row_index)
+
+        for (p_home, p_draw, p_away), explanation, i, key in zip(percentages, explanations, row_index, row_keys):
+            results[i] = {
+                "home_win_prob": p_home,
+                "draw_prob": p_draw,
+                "away_win_prob": p_away,
+                "reasoning": explanation
             }
+            if key is not None:
+                self._cache_put(key, results[i])
+
+        return results
 
-        home_team = match_data['home_team']
-        away_team = match_data['away_team']
+    def _dict_inputs(self, fixtures, explain):
+        """
+        (results with fallbacks / cache hits filled, model input matrix, row of each input, cache keys)
+        for a list of fixture mappings.
+        """
+        # Encode every distinct team name once for the whole batch
+        names = {m['home_team'] for m in fixtures} | {m['away_team'] for m in fixtures}
+        codes = {name: self.get_team_code(name) for name in names}
+
+        results = [None] * len(fixtures)
+        rows = []
+        row_index = []
+        row_keys = []
+        for i, match_data in enumerate(fixtures):
+            home_code = codes[match_data['home_team']]
+            away_code = codes[match_data['away_team']]
+            if home_code is None or away_code is None:
+                # Fallback logic if teams not found
+                results[i] = self._fallback_prediction(match_data)
+                continue
+            key = None
+            if self.cache_size:
+                key = self._cache_key(match_data, home_code, away_code, explain)
+                cached = self._cache_get(key)
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            row_keys.append(key)
+            # Prepare input for model: Team Codes + Market Odds
+            row = [
+                home_code,
+                away_code,
+                match_data.get('avg_odds_home', 2.0),
+                match_data.get('avg_odds_draw', 3.0),
+                match_data.get('avg_odds_away', 3.0)
+            ]
+            if self.uses_match_features:
+                row += self._match_features(match_data, home_code, away_code)
+            rows.append(row)
+            row_index.append(i)
+        return results, np.array(rows, dtype=np.float64), row_index, row_keys
+
+    def _store_inputs(self, fixtures, explain):
+        """
+        The same for a FixtureStore, read column-wise: team names and odds come from
+        model_columns() and the input matrix is stacked from arrays, with no per-row lookups.
+        """
+        home, away, odds = fixtures.model_columns()
+        home = home.tolist()
+        away = away.tolist()
+        codes = {name: self.get_team_code(name) for name in set(home) | set(away)}
+        home_codes = [codes[name] for name in home]
+        away_codes = [codes[name] for name in away]
 
-        home_code = self.get_team_code(home_team)
-        away_code = self.get_team_code(away_team)
+        results = [None] * len(fixtures)
+        row_index = []
+        for i, (home_code, away_code) in enumerate(zip(home_codes, away_codes)):
+            if home_code is None or away_code is None:
+                # Fallback logic if teams not found
+                results[i] = self._fallback_prediction(fixtures[i])
+            else:
+                row_index.append(i)
 
-        if home_code is None or away_code is None:
-            # Fallback logic if teams not found
-            return self._fallback_prediction(match_data)
+        match_times = self._store_values(fixtures, 'match_time') if self.uses_match_features else None
+        row_keys = [None] * len(row_index)
+        if self.cache_size and row_index:
+            keys = self._store_cache_keys(fixtures, home, away, home_codes, away_codes, odds, match_times,
+                                          explain)
+            missed = []
+            for i in row_index:
+                cached = self._cache_get(keys[i])
+                if cached is None:
+                    missed.append(i)
+                else:
+                    results[i] = cached
+            row_index = missed
+            row_keys = [keys[i] for i in row_index]
 
         # Prepare input for model: Team Codes + Market Odds
-        odds_h = match_data.get('avg_odds_home', 2.0)
-        odds_d = match_data.get('avg_odds_draw', 3.0)
-        odds_a = match_data.get('avg_odds_away', 3.0)
-        
-        input_data = pd.DataFrame([[home_code, away_code, odds_h, odds_d, odds_a]], 
-                                  columns=['HomeTeam_Code', 'AwayTeam_Code', 'AvgH', 'AvgD', 'AvgA'])
-        
-        # Get probabilities [Away, Draw, Home] -> FTR is 0(A), 1(D), 2(H)
-        # Check classes_ attribute to be sure
-        probs = self.model.predict_proba(input_data)[0]
-        
-        # Map probabilities to outcomes based on class order
-        classes = self.model.classes_ # Expected [0, 1, 2]
-        
-        p_away = 0
-        p_draw = 0
-        p_home = 0
-        
-        for cls, prob in zip(classes, probs):
-            if cls == 0: p_away = prob
-            elif cls == 1: p_draw = prob
-            elif cls == 2: p_home = prob
-
-        # Convert to percentage
-        p_home = round(p_home * 100, 1)
-        p_draw = round(p_draw * 100, 1)
-        p_away = round(p_away * 100, 1)
-
-        # Generate Reasoning using the new Engine
-        explanation = self.generate_explanation(
-            match_data,
-            {'home': p_home, 'draw': p_draw, 'away': p_away}
-        )
+        X = np.empty((len(row_index), 2 + odds.shape[1]), dtype=np.float64)
+        X[:, 0] = [home_codes[i] for i in row_index]
+        X[:, 1] = [away_codes[i] for i in row_index]
+        X[:, 2:] = odds[row_index]
+        if self.uses_match_features and row_index:
+            features = [self._match_features({'match_time': match_times[i]}, home_codes[i], away_codes[i])
+                        for i in row_index]
+            X = np.hstack([X, np.array(features, dtype=np.float64)])
+        return results, X, row_index, row_keys
 
-        return {
-            "home_win_prob": p_home,
-            "draw_prob": p_draw,
-            "away_win_prob": p_away,
-            "reasoning": explanation
-        }
+    @staticmethod
+    def _store_values(fixtures, name):
+        # A column as Python values with missing entries (None / NaN) as None, like Fixture.get
+        if name not in fixtures.names:
+            return [None] * len(fixtures)
+        return [None if _is_missing(v) else v for v in fixtures.column(name).tolist()]
+
+    def _store_cache_keys(self, fixtures, home, away, home_codes, away_codes, odds, match_times,
+                          explain):
+        """
+        _cache_key for every row of a FixtureStore, built from its columns.
+        """
+        # Python's round, as in _cache_key (np.round can differ in the last digit)
+        rounded = [[round(value, ODDS_KEY_DECIMALS) for value in row] for row in odds.tolist()]
+        n = len(fixtures)
+        times = match_times if self.uses_match_features else [None] * n
+        if explain:
+            form_home = [tuple(f) for f in fixtures.column('last_5_matches_home').tolist()]
+            form_away = [tuple(f) for f in fixtures.column('last_5_matches_away').tolist()]
+            strengths = list(zip(*[self._store_values(fixtures, field) for field in EXPLANATION_FIELDS]))
+        else:
+            form_home = form_away = strengths = [None] * n
+        locale = self.locale if explain else None
+        return [
+            (home_codes[i], away_codes[i], *rounded[i], home[i], away[i], times[i],
+             form_home[i], form_away[i], strengths[i], explain, locale)
+            for i in range(n)
+        ]
+
+    def _match_features(self, match_data, home_code, away_code):
+        """
+        Live form / goal difference / rest / Elo features from the saved training history.
+        """
+        try:
+            date = datetime.fromisoformat(match_data['match_time'])
+        except (KeyError, TypeError, ValueError):
+            date = None
+        return self.feature_state.features(
+            str(self.encoder.classes_[home_code]),
+            str(self.encoder.classes_[away_code]),
+            date
+        )
 
+    @instrumentation.timed('generate_explanation')
     def generate_explanation(self, match_data, probs):
         """
         Generates a conversational explanation for the prediction, leveraging FPL strength data if available.
+        The rules and wording live in explanations.py; predict_matches explains whole batches at once.
         """
-        home_team = match_data['home_team']
-        away_team = match_data['away_team']
-        home_form = match_data['last_5_matches_home']
-        away_form = match_data['last_5_matches_away']
-        
-        # Determine Winner
-        if probs['home'] > probs['away'] and probs['home'] > probs['draw']:
-            winner = home_team
-            win_prob = probs['home']
-            is_home_win = True
-        elif probs['away'] > probs['home'] and probs['away'] > probs['draw']:
-            winner = away_team
-            win_prob = probs['away']
-            is_home_win = False
-        else:
-            winner = "Draw"
-            win_prob = probs['draw']
-            is_home_win = None
-
-        text = []
-        
-        # 1. FPL Strength Analysis (New)
-        # Check if FPL data is present (it might not be if API failed or offline)
-        h_att = match_data.get('home_strength_attack')
-        a_def = match_data.get('away_strength_defence')
-        
-        if h_att and a_def:
-            # Simple heuristic: High Attack vs Low Defense
-            # FPL ratings are usually around 1000-1350
-            if is_home_win and h_att > a_def + 50:
-                text.append(f"{home_team}'s attack (Rated {h_att}) is expected to overwhelm {away_team}'s defense.")
-            elif not is_home_win and match_data.get('away_strength_attack', 0) > match_data.get('home_strength_defence', 0) + 50:
-                 text.append(f"{away_team}'s superior attacking options are the key difference.")
-
-        # 2. Confidence Check
-        if winner == "Draw":
-            text.append("The model predicts a deadlock due to evenly matched historical performance.")
-        elif win_prob > 60:
-            text.append(f"Strong statistical advantage detected for {winner}.")
-        elif win_prob > 40:
-            text.append(f"A tightly contested match is expected, with a slight edge for {winner}.")
-        else:
-            text.append(f"The outcome is uncertain, but {winner} is marginally favored.")
-
-        # 3. Form Factor
-        # Calculate recent wins
-        home_wins = home_form.count('W')
-        away_wins = away_form.count('W')
-        
-        if is_home_win is True and home_wins > away_wins:
-            text.append("Recent form is a key differentiator.")
-        elif is_home_win is False and away_wins > home_wins:
-            text.append(f"{winner} enters the match in better form.")
-        elif is_home_win is True and home_form.count('L') >= 3:
-            # Nuance: Favored despite bad form (likely odds/strength factor)
-            text.append(f"Despite recent struggles, {winner} is tipped to bounce back.")
-            
-        return " ".join(text)
+        return explain_batch([match_data], [[probs['home'], probs['draw'], probs['away']]], self.locale)[0]
 
     def _fallback_prediction(self, match_data):
         # Fallback to simple logic if ML model fails for specific teams
@@ -0,0 +1,123 @@
+"""
+What-If scenario engine for the app's simulation sidebar.
+
+For one fixture, every combination of home form (1-5) x away form (1-5) x key-player injury
+(off / on) is scored in a single batched predict_matches call. Slider moves then just index
+into the cached result, and the same tensor feeds the sensitivity heatmap.
+"""
+import threading
+from collections import OrderedDict
+import numpy as np
+
+FORM_LEVELS = (1, 2, 3, 4, 5)
+# Neutral slider position: no odds adjustment
+NEUTRAL_FORM = 3
+# Each form point away from neutral moves the team's odds by 10%
+FORM_ODDS_STEP = 0.1
+# A missing key player lengthens the home odds by 15%
+INJURY_ODDS_FACTOR = 0.15
+# Cached grids (one per fixture / model version)
+GRID_CACHE_SIZE = 64
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_sim_form_str(level):
+    """
+    Simulated Form Strings for Explanation Engine
+    If slider is 5, give them 5 Wins. If 1, give them 5 Losses.
+    """
+    if level == 5: return ["W", "W", "W", "W", "W"]
+    if level == 4: return ["W", "W", "D", "W", "D"]
+    if level == 3: return ["W", "L", "D", "W", "L"]
+    if level == 2: return ["L", "L", "D", "L", "D"]
+    return ["L", "L", "L", "L", "L"]
+
+
+def simulate_match(match, home_form, away_form, injury):
+    """
+    Returns a copy of `match` with odds and form adjusted for one What-If scenario.
+    """
+    # Logic: Better form -> Lower odds (Stronger)
+    form_factor_h = (NEUTRAL_FORM - home_form) * FORM_ODDS_STEP
+    form_factor_a = (NEUTRAL_FORM - away_form) * FORM_ODDS_STEP
+    # Injury Factor: Injury -> Higher odds (Weaker)
+    injury_factor = INJURY_ODDS_FACTOR if injury else 0.0
+
+    simulated = match.copy()
+    simulated['avg_odds_home'] = match.get('avg_odds_home', 2.5) * (1 + form_factor_h + injury_factor)
+    # Injury check is for the home team only
+    simulated['avg_odds_away'] = match.get('avg_odds_away', 2.5) * (1 + form_factor_a)
+    simulated['last_5_matches_home'] = get_sim_form_str(home_form)
+    simulated['last_5_matches_away'] = get_sim_form_str(away_form)
+    return simulated
+
+
+class ScenarioGrid:
+    """
+    Predictions for every scenario of one fixture.
+    probs[h, a, i] is (home, draw, away) in percent for home form FORM_LEVELS[h],
+    away form FORM_LEVELS[a] and injury i (0 / 1).
+    """
+
+    def __init__(self, match, predictions):
+        self.match = match
+        self.predictions = predictions
+        self.probs = np.array([
+            [p['home_win_prob'], p['draw_prob'], p['away_win_prob']] for p in predictions
+        ]).reshape(len(FORM_LEVELS), len(FORM_LEVELS), 2, 3)
+
+    @staticmethod
+    def _index(home_form, away_form, injury):
+        return (FORM_LEVELS.index(home_form) * len(FORM_LEVELS) + FORM_LEVELS.index(away_form)) * 2 + int(bool(injury))
+
+    def prediction(self, home_form, away_form, injury):
+        """
+        The predict_match result for one scenario.
+        """
+        return self.predictions[self._index(home_form, away_form, injury)]
+
+    def sensitivity(self, injury, outcome=0):
+        """
+        (home form x away form) matrix of one outcome's probability (0 home, 1 draw, 2 away).
+        """
+        return self.probs[:, :, int(bool(injury)), outcome]
+
+
+def _match_key(match):
+    return (
+        match.get('id'),
+        match['home_team'],
+        match['away_team'],
+        match.get('avg_odds_home'),
+        match.get('avg_odds_draw'),
+        match.get('avg_odds_away'),
+        tuple(sorted((k, v) for k, v in match.items() if k.endswith(('_attack', '_defence', '_overall'))))
+    )
+
+
+def scenario_grid(predictor, match):
+    """
+    Returns the (cached) ScenarioGrid for `match`, scoring all scenarios in one batch on a miss.
+    """
+    key = (predictor.serving_version, _match_key(match))
+    with _cache_lock:
+        grid = _cache.get(key)
+        if grid is not None:
+            _cache.move_to_end(key)
+            return grid
+
+    scenarios = [
+        simulate_match(match, home_form, away_form, injury)
+        for home_form in FORM_LEVELS
+        for away_form in FORM_LEVELS
+        for injury in (False, True)
+    ]
+    grid = ScenarioGrid(match, predictor.predict_matches(scenarios))
+
+    with _cache_lock:
+        _cache[key] = grid
+        while len(_cache) > GRID_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return grid
@@ -0,0 +1,107 @@
+"""
+Headless batch scoring: streams fixtures in, predictions out, with bounded memory.
+
+Reads CSV or JSONL from a file or stdin in fixed-size chunks, scores each chunk with one
+MatchPredictor.predict_matches call and writes the results as they are produced.
+Accepts both the app's fixture fields (home_team, avg_odds_home, ...) and football-data
+CSV columns (HomeTeam, AvgH, ...), so historical season files can be rescored directly.
+
+Usage:
+    python score_fixtures.py season24.csv --output scored.jsonl --no-explain
+    python score_fixtures.py season24.csv --output scored.jsonl --explain-codes
+    cat fixtures.jsonl | python score_fixtures.py --format jsonl --output-format csv > scored.csv
+"""
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import sys
+
+from fixture_store import parse_record
+from predictor import MatchPredictor
+
+# football-data column -> fixture field
+COLUMN_ALIASES = {
+    'HomeTeam': 'home_team',
+    'AwayTeam': 'away_team',
+    'AvgH': 'avg_odds_home',
+    'AvgD': 'avg_odds_draw',
+    'AvgA': 'avg_odds_away',
+}
+OUTPUT_FIELDS = ['home_team', 'away_team', 'home_win_prob', 'draw_prob', 'away_win_prob', 'reasoning']
+
+
+def read_fixtures(stream, fmt):
+    """
+    Yields fixture dicts one at a time from a CSV or JSONL stream.
+    """
+    rows = csv.DictReader(stream) if fmt == 'csv' else (json.loads(line) for line in stream if line.strip())
+    for row in rows:
+        # Same conversions as fixture files: float odds, numeric strengths, form lists
+        # ("W,L,D,W,W" or "WLDWW"); empty cells are left out
+        yield parse_record({COLUMN_ALIASES.get(k, k): v for k, v in row.items()})
+
+
+def score(stream, out, fmt='csv', output_format='jsonl', chunk_size=10000, explain=True, predictor=None):
+    """
+    Scores every fixture in `stream`, chunk by chunk, writing results to `out`. Returns the row count.
+    """
+    # Historical rows rarely repeat, so skip the prediction cache
+    predictor = predictor or MatchPredictor(cache_size=0)
+    fields = OUTPUT_FIELDS if explain else OUTPUT_FIELDS[:-1]
+    writer = None
+    if output_format == 'csv':
+        writer = csv.DictWriter(out, fieldnames=['id'] + fields, extrasaction='ignore')
+        writer.writeheader()
+
+    fixtures = read_fixtures(stream, fmt)
+    count = 0
+    while True:
+        chunk = list(itertools.islice(fixtures, chunk_size))
+        if not chunk:
+            break
+        for fixture, prediction in zip(chunk, predictor.predict_matches(chunk, explain=explain)):
+            record = {'id': fixture.get('id', count), 'home_team': fixture['home_team'], 'away_team': fixture['away_team']}
+            record.update(prediction)
+            if not explain:
+                record.pop('reasoning', None)
+            if writer:
+                writer.writerow(record)
+            else:
+                out.write(json.dumps(record) + "\n")
+            count += 1
+        out.flush()
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score fixtures from CSV/JSONL without the web UI.")
+    parser.add_argument('input', nargs='?', default='-', help="Fixture file (default: stdin)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default=None,
+                        help="Input format (default: from the file extension, jsonl for stdin)")
+    parser.add_argument('--output', default='-', help="Output file (default: stdout)")
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'], default=None,
+                        help="Output format (default: from the output extension, jsonl for stdout)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Fixtures scored per model call")
+    parser.add_argument('--no-explain', action='store_true', help="Skip explanation text for throughput")
+    parser.add_argument('--explain-codes', action='store_true',
+                        help="Write compact rule codes (e.g. 'strong form_home') instead of explanation text")
+    args = parser.parse_args()
+
+    fmt = args.format or ('csv' if args.input.endswith('.csv') else 'jsonl')
+    output_format = args.output_format or ('csv' if args.output.endswith('.csv') else 'jsonl')
+
+    stream = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        # Predictor status messages go to stderr so stdout carries only results
+        with contextlib.redirect_stdout(sys.stderr):
+            explain = False if args.no_explain else 'codes' if args.explain_codes else True
+            n = score(stream, out, fmt, output_format, args.chunk_size, explain)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"Scored {n} fixtures.", file=sys.stderr)
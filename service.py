@@ -0,0 +1,298 @@
+"""
+Asynchronous prediction service with request micro-batching (standard library only).
+
+Concurrent POST /predict requests are collected for up to `--window-ms` milliseconds (or until
+`--max-batch` requests are waiting) and scored together with one
+MatchPredictor.predict_matches call; each caller then receives its own result.
+The model is loaded once per worker process through model_registry.
+
+Endpoints:
+    POST /predict   body: one fixture as JSON (same fields as data_loader fixtures)
+    GET  /metrics   throughput, batch size and latency percentiles as JSON
+    GET  /metrics/prometheus   the same plus instrumentation.py timings, as Prometheus text
+    GET  /health    liveness check
+
+Usage:
+    python service.py --port 8000 --workers 4
+"""
+import argparse
+import asyncio
+import functools
+import json
+import math
+import multiprocessing
+import time
+from collections import deque
+
+import instrumentation
+from model_registry import get_predictor
+from predictor import EXPLANATION_FIELDS
+
+MAX_BODY_BYTES = 1 << 20
+ODDS_FIELDS = ('avg_odds_home', 'avg_odds_draw', 'avg_odds_away')
+FORM_FIELDS = ('last_5_matches_home', 'last_5_matches_away')
+
+
+def parse_fixture(body):
+    """
+    Checks and normalizes one /predict body before it joins a batch, so a bad request fails
+    on its own instead of failing the batch. Raises ValueError with the reason.
+    """
+    fixture = json.loads(body)
+    if not isinstance(fixture, dict):
+        raise ValueError("Request body must be a JSON object")
+    for field in ('home_team', 'away_team'):
+        if not isinstance(fixture.get(field), str):
+            raise ValueError("home_team and away_team are required (strings)")
+    for field in ODDS_FIELDS:
+        if field in fixture:
+            value = fixture[field]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"{field} must be a number")
+            fixture[field] = float(value)
+    for field in EXPLANATION_FIELDS:
+        # FPL ratings are optional (null: no rating)
+        value = fixture.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"{field} must be a number or null")
+    for field in FORM_FIELDS:
+        form = fixture.setdefault(field, [])
+        if not isinstance(form, list) or not all(isinstance(r, str) for r in form):
+            raise ValueError(f"{field} must be a list of results, e.g. [\"W\", \"D\", \"L\"]")
+    if fixture.get('match_time') is not None and not isinstance(fixture['match_time'], str):
+        raise ValueError("match_time must be an ISO date string")
+    return fixture
+
+
+class Metrics:
+    """
+    Request counters plus a rolling window of latencies for percentile reporting.
+    """
+
+    def __init__(self, window=10000):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3)
+
+        uptime = time.monotonic() - self.started
+        return {
+            "uptime_seconds": round(uptime, 1),
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": round(self.requests / uptime, 2) if uptime else 0.0,
+            "batches": self.batches,
+            "mean_batch_size": round(self.batched_requests / self.batches, 2) if self.batches else 0.0,
+            "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99)}
+        }
+
+
+class MicroBatcher:
+    """
+    Collects predictions requested within one time window and runs them as a single batch.
+    """
+
+    def __init__(self, predictor, metrics, window_ms=5.0, max_batch=256):
+        self.predictor = predictor
+        self.metrics = metrics
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        # Created by run(), on the running loop (Python 3.9 binds a queue to the loop current at creation)
+        self.queue = None
+
+    async def predict(self, fixture):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((fixture, future))
+        return await future
+
+    def start(self):
+        """
+        Creates the queue on the running loop and starts run() as a task.
+        """
+        self.queue = asyncio.Queue()
+        return asyncio.create_task(self.run())
+
+    def _score(self, fixtures):
+        # One profile per batch when FP_PROFILE is set (the batch is what the requests wait on)
+        with instrumentation.profile('predict_batch'):
+            return self.predictor.predict_matches(fixtures)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            fixtures = [fixture for fixture, _ in batch]
+            try:
+                # Scoring is CPU-bound: keep it off the event loop so requests keep arriving
+                results = await loop.run_in_executor(None, functools.partial(self._score, fixtures))
+            except Exception:
+                # Rescore row by row so only the requests that fail get an error
+                results = None
+
+            self.metrics.batches += 1
+            self.metrics.batched_requests += len(batch)
+            for i, (fixture, future) in enumerate(batch):
+                if results is not None:
+                    result = results[i]
+                else:
+                    try:
+                        result = (await loop.run_in_executor(None, functools.partial(self._score, [fixture])))[0]
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                        continue
+                if not future.done():
+                    future.set_result(result)
+
+
+class PredictionService:
+    def __init__(self, window_ms=5.0, max_batch=256):
+        self.predictor = get_predictor()
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(self.predictor, self.metrics, window_ms, max_batch)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.dispatch(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, close=not keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        path = path.split('?', 1)[0]
+        if method == 'GET' and path == '/health':
+            return 200, {"status": "ok", "model_loaded": bool(self.predictor.model)}
+        if method == 'GET' and path == '/metrics/prometheus':
+            return 200, self._prometheus_text()
+        if method == 'GET' and path == '/metrics':
+            return 200, {**self.metrics.snapshot(), "prediction_cache": self.predictor.cache_info()}
+        if method == 'POST' and path == '/predict':
+            started = time.perf_counter()
+            self.metrics.requests += 1
+            try:
+                fixture = parse_fixture(body)
+            except ValueError as e:
+                self.metrics.errors += 1
+                return 400, {"error": str(e)}
+            try:
+                result = await self.batcher.predict(fixture)
+            except Exception as e:
+                self.metrics.errors += 1
+                print(f"Prediction failed: {type(e).__name__}: {e}")
+                return 500, {"error": "Prediction failed"}
+            self.metrics.latencies.append(time.perf_counter() - started)
+            return 200, result
+        return 404, {"error": "Not found"}
+
+    def _prometheus_text(self):
+        m = self.metrics.snapshot()
+        p = instrumentation.PROMETHEUS_PREFIX
+        lines = [
+            f"{p}_requests_total {m['requests']}",
+            f"{p}_request_errors_total {m['errors']}",
+            f"{p}_batches_total {m['batches']}",
+        ]
+        for q, value in m['latency_ms'].items():
+            if value is not None:
+                lines.append(f'{p}_request_latency_seconds{{quantile="0.{q[1:]}"}} {value / 1000}')
+        return "\n".join(lines) + "\n" + instrumentation.prometheus_text()
+
+    async def _respond(self, writer, status, payload, close=False):
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                  500: 'Internal Server Error'}[status]
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    async def serve(self, host, port, reuse_port=False):
+        batcher_task = self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port, reuse_port=reuse_port)
+        print(f"Serving predictions on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher_task.cancel()
+
+
+def run_worker(host, port, window_ms, max_batch, reuse_port):
+    instrumentation.start()
+    service = PredictionService(window_ms, max_batch)
+    asyncio.run(service.serve(host, port, reuse_port))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching HTTP prediction service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--window-ms', type=float, default=5.0, help="Batching window in milliseconds")
+    parser.add_argument('--max-batch', type=int, default=256, help="Largest batch scored in one call")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes sharing the port via SO_REUSEPORT (each loads the model once)")
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        run_worker(args.host, args.port, args.window_ms, args.max_batch, False)
+    else:
+        workers = [
+            multiprocessing.Process(target=run_worker,
+                                    args=(args.host, args.port, args.window_ms, args.max_batch, True))
+            for _ in range(args.workers)
+        ]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
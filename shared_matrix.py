@@ -0,0 +1,40 @@
+"""
+Chronological training matrix shared by worker processes (tune_model.py, backtest.py).
+
+date_order() sorts the encoded matches by their parsed Date. save() writes X / y once as .npy
+files, and init_worker() (the pool initializer) memory-maps them read-only in every worker,
+so the processes share one copy of the matrix instead of receiving their own.
+"""
+import os
+import numpy as np
+
+from features import parse_dates
+
+# Set in each worker by init_worker: read-only memory maps of X.npy and y.npy
+X = None
+y = None
+
+
+def date_order(X, y, dates):
+    """
+    X, y and their parsed dates in chronological order (ties keep file order).
+    Matches with unparseable dates are dropped.
+    """
+    dates = parse_dates(dates).reset_index(drop=True)
+    known = dates.notna().to_numpy()
+    order = np.argsort(dates[known].to_numpy(dtype='datetime64[ns]'), kind='stable')
+    return X[known].iloc[order], y[known].iloc[order], dates[known].iloc[order]
+
+
+def save(directory, X, y):
+    """
+    Writes X (float32) and y (int64) to `directory` for init_worker.
+    """
+    np.save(os.path.join(directory, 'X.npy'), np.ascontiguousarray(X.to_numpy(dtype=np.float32)))
+    np.save(os.path.join(directory, 'y.npy'), y.to_numpy(dtype=np.int64))
+
+
+def init_worker(directory):
+    global X, y
+    X = np.load(os.path.join(directory, 'X.npy'), mmap_mode='r')
+    y = np.load(os.path.join(directory, 'y.npy'), mmap_mode='r')
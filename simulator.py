@@ -0,0 +1,167 @@
+"""
+Monte Carlo season / matchweek simulator on top of MatchPredictor.
+
+Every remaining fixture gets its home/draw/away probabilities from the model, then whole
+seasons are sampled as NumPy arrays: one uniform draw per (simulation, fixture), points
+accumulated into the table with a matrix product and positions ranked per simulation.
+No Python loop runs per match or per simulation; simulations are processed in chunks
+(optionally in parallel processes with independent RNG streams from one SeedSequence).
+
+Usage:
+    python simulator.py                          # current matchweek from data_loader
+    python simulator.py schedule.csv --table standings.json --sims 200000 --workers 4
+"""
+import argparse
+import json
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Places counted for each summary column (relegation counts from the bottom)
+TOP_N = 4
+RELEGATION_PLACES = 3
+
+
+def _simulate_chunk(probs, home_idx, away_idx, base_points, n_sims, seed_seq):
+    """
+    Simulates `n_sims` seasons. Returns (position_counts, points_hist), both summable across chunks.
+    position_counts[t, p]: simulations where team t finished in position p (0 = first).
+    points_hist[t, k]: simulations where team t finished on k points.
+    """
+    rng = np.random.default_rng(seed_seq)
+    n_matches = len(probs)
+    n_teams = len(base_points)
+
+    # Fixture -> team incidence, so match points reduce to the table with one matrix product
+    home_onehot = np.zeros((n_matches, n_teams), dtype=np.float32)
+    away_onehot = np.zeros((n_matches, n_teams), dtype=np.float32)
+    home_onehot[np.arange(n_matches), home_idx] = 1
+    away_onehot[np.arange(n_matches), away_idx] = 1
+
+    u = rng.random((n_sims, n_matches), dtype=np.float32)
+    home_win = u < probs[:, 0]
+    draw = ~home_win & (u < probs[:, 0] + probs[:, 1])
+    away_win = ~home_win & ~draw
+
+    home_points = (3 * home_win + draw).astype(np.float32)
+    away_points = (3 * away_win + draw).astype(np.float32)
+    points = (home_points @ home_onehot + away_points @ away_onehot).astype(np.int32) + base_points
+
+    # Random tie-break between teams level on points (goal difference is not simulated)
+    order = np.argsort(-(points + rng.random(points.shape)), axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(n_teams)[None, :], axis=1)
+
+    team_offsets = np.arange(n_teams)[None, :] * n_teams
+    position_counts = np.bincount((positions + team_offsets).ravel(), minlength=n_teams * n_teams)
+
+    max_points = int(base_points.max()) + 3 * n_matches + 1
+    points_hist = np.bincount(
+        (points + np.arange(n_teams)[None, :] * max_points).ravel(),
+        minlength=n_teams * max_points
+    )
+    return position_counts.reshape(n_teams, n_teams), points_hist.reshape(n_teams, max_points)
+
+
+def simulate_season(fixtures, probs, current_points=None, n_sims=100000, seed=0,
+                    workers=1, chunk_size=10000):
+    """
+    fixtures: list of dicts with home_team / away_team (the remaining schedule)
+    probs: (n_fixtures, 3) home/draw/away probabilities (percentages or fractions; rows are normalised)
+    current_points: optional {team: points already earned}
+
+    Returns {team: {...}} with title / top-4 / relegation probabilities (percent), expected
+    points, points percentiles, the full position distribution and the points distribution.
+    """
+    teams = sorted({f['home_team'] for f in fixtures} | {f['away_team'] for f in fixtures}
+                   | set(current_points or {}))
+    index = {team: i for i, team in enumerate(teams)}
+    home_idx = np.array([index[f['home_team']] for f in fixtures], dtype=np.intp)
+    away_idx = np.array([index[f['away_team']] for f in fixtures], dtype=np.intp)
+    base_points = np.array([(current_points or {}).get(team, 0) for team in teams], dtype=np.int32)
+
+    probs = np.asarray(probs, dtype=np.float64).reshape(len(fixtures), 3)
+    probs = (probs / probs.sum(axis=1, keepdims=True)).astype(np.float32)
+
+    # Independent, reproducible stream per chunk regardless of how chunks are spread over workers
+    sizes = [min(chunk_size, n_sims - start) for start in range(0, n_sims, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(probs, home_idx, away_idx, base_points, size, s) for size, s in zip(sizes, seeds)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        chunks = [_simulate_chunk(*a) for a in args]
+
+    position_counts = sum(c[0] for c in chunks)
+    max_points = max(c[1].shape[1] for c in chunks)
+    points_hist = sum(np.pad(c[1], ((0, 0), (0, max_points - c[1].shape[1]))) for c in chunks)
+
+    n_teams = len(teams)
+    # Leagues this small (e.g. a single matchweek) have no relegation zone
+    relegation_from = n_teams - RELEGATION_PLACES if n_teams > RELEGATION_PLACES else n_teams
+    results = {}
+    for t, team in enumerate(teams):
+        position_pct = position_counts[t] / n_sims * 100
+        cdf = np.cumsum(points_hist[t]) / n_sims
+        results[team] = {
+            "title_pct": round(float(position_pct[0]), 2),
+            f"top{TOP_N}_pct": round(float(position_pct[:TOP_N].sum()), 2),
+            "relegation_pct": round(float(position_pct[relegation_from:].sum()), 2),
+            "expected_points": round(float(points_hist[t] @ np.arange(max_points) / n_sims), 2),
+            "points_p5": int(np.searchsorted(cdf, 0.05)),
+            "points_p50": int(np.searchsorted(cdf, 0.50)),
+            "points_p95": int(np.searchsorted(cdf, 0.95)),
+            "position_pct": [round(float(p), 3) for p in position_pct],
+            "points_distribution": {int(k): int(v) for k, v in enumerate(points_hist[t]) if v}
+        }
+    return results
+
+
+def season_odds(fixtures, predictor, current_points=None, **kwargs):
+    """
+    Scores the fixtures with `predictor` (one batched call) and runs simulate_season.
+    """
+    predictions = predictor.predict_matches(fixtures, explain=False)
+    probs = [[p['home_win_prob'], p['draw_prob'], p['away_win_prob']] for p in predictions]
+    return simulate_season(fixtures, probs, current_points, **kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo season simulation.")
+    parser.add_argument('schedule', nargs='?', default=None,
+                        help="Remaining fixtures as CSV/JSONL (default: data_loader.get_current_fixtures)")
+    parser.add_argument('--table', default=None, help="JSON file of current points: {\"Arsenal\": 45, ...}")
+    parser.add_argument('--sims', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1, help="Processes used for simulation chunks")
+    parser.add_argument('--output', default=None, help="Write full results as JSON")
+    args = parser.parse_args()
+
+    if args.schedule:
+        from score_fixtures import read_fixtures
+        with open(args.schedule, newline='', encoding='utf-8') as f:
+            fixtures = list(read_fixtures(f, 'csv' if args.schedule.endswith('.csv') else 'jsonl'))
+    else:
+        from data_loader import get_current_fixtures
+        fixtures = get_current_fixtures()
+
+    current_points = None
+    if args.table:
+        with open(args.table, encoding='utf-8') as f:
+            current_points = json.load(f)
+
+    from model_registry import get_predictor
+    results = season_odds(fixtures, get_predictor(), current_points,
+                          n_sims=args.sims, seed=args.seed, workers=args.workers)
+
+    print(f"{'Team':<24}{'Title %':>9}{'Top ' + str(TOP_N) + ' %':>9}{'Rel %':>8}{'xPts':>8}")
+    for team, r in sorted(results.items(), key=lambda kv: -kv[1]['expected_points']):
+        print(f"{team:<24}{r['title_pct']:>9.2f}{r[f'top{TOP_N}_pct']:>9.2f}"
+              f"{r['relegation_pct']:>8.2f}{r['expected_points']:>8.2f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}", file=sys.stderr)
@@ -0,0 +1,56 @@
+"""
+Append-only label encoder for team names.
+"""
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+
+class TeamEncoder(LabelEncoder):
+    """
+    LabelEncoder whose codes never change once assigned.
+
+    The first fit numbers teams alphabetically, exactly like LabelEncoder. Later calls to
+    extend() append newly promoted teams after the existing ones, so codes already baked
+    into a trained model stay valid. classes_ is therefore in code order, not sorted.
+    """
+
+    def fit(self, y):
+        self.classes_ = np.array([], dtype=object)
+        return self.extend(y)
+
+    def fit_transform(self, y):
+        return self.fit(y).transform(y)
+
+    def extend(self, y):
+        """
+        Appends unseen names (alphabetically among themselves). Returns self.
+        """
+        known = set(self.classes_)
+        new = sorted({str(name) for name in y} - known)
+        if new:
+            self.classes_ = np.concatenate([self.classes_.astype(object), np.array(new, dtype=object)])
+        self._codes = {name: code for code, name in enumerate(self.classes_)}
+        return self
+
+    def transform(self, y):
+        try:
+            return np.array([self._codes[name] for name in y], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"y contains previously unseen labels: {e.args[0]!r}")
+
+    def inverse_transform(self, y):
+        return self.classes_[np.asarray(y, dtype=np.int64)]
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._codes = {name: code for code, name in enumerate(self.classes_)}
+
+    @classmethod
+    def from_label_encoder(cls, encoder):
+        """
+        Wraps a plain fitted LabelEncoder, keeping its codes.
+        """
+        team_encoder = cls()
+        team_encoder.classes_ = np.asarray(encoder.classes_, dtype=object)
+        team_encoder._codes = {name: code for code, name in enumerate(team_encoder.classes_)}
+        return team_encoder
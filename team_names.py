@@ -0,0 +1,54 @@
+"""
+Team name aliases shared by the data loader and the predictor.
+
+Three naming schemes meet in this project:
+- Fixture / display names (e.g. "Manchester United") used in data_loader fixtures
+- FPL API names (e.g. "Man Utd") returned by bootstrap-static
+- football-data.co.uk CSV names (e.g. "Man United") the LabelEncoder was fitted on
+"""
+import re
+
+# FPL API name -> fixture name
+FPL_ALIASES = {
+    "Man Utd": "Manchester United",
+    "Man City": "Manchester City",
+    "Spurs": "Tottenham",
+    "Forest": "Nottingham Forest",
+    "Nott'm Forest": "Nottingham Forest",
+}
+
+# Fixture name -> football-data CSV name
+CSV_ALIASES = {
+    "Manchester United": "Man United",
+    "Manchester City": "Man City",
+    "Nottingham Forest": "Nott'm Forest",
+    "Luton Town": "Luton",
+    "Wolverhampton Wanderers": "Wolves",
+    "Newcastle United": "Newcastle",
+    "Brighton & Hove Albion": "Brighton",
+    "Tottenham Hotspur": "Tottenham",
+    "West Ham United": "West Ham",
+    "Leicester City": "Leicester",
+    "Ipswich Town": "Ipswich",
+    "Leeds United": "Leeds",
+    "AFC Bournemouth": "Bournemouth",
+}
+
+_AFFIXES = re.compile(r"^(afc|fc)\s+|\s+(afc|fc)$")
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def normalize(name):
+    """
+    Reduces a team name to a comparison key: lowercase, no "FC"/"AFC", letters and digits only.
+    """
+    key = _AFFIXES.sub("", name.strip().lower())
+    return _NON_ALNUM.sub("", key)
+
+
+def to_csv_name(name):
+    """
+    Maps a fixture or FPL name to the football-data CSV name (unchanged if no alias is known).
+    """
+    name = FPL_ALIASES.get(name, name)
+    return CSV_ALIASES.get(name, name)
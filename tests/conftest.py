@@ -0,0 +1,125 @@
+"""
+Shared fixtures: a local HTTP stand-in for the FPL API and the enrichment sources, and a small
+model trained on a synthetic season.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubServer:
+    """
+    Serves `routes` on 127.0.0.1: path -> callable(request) returning (status, headers, body).
+    A route can also be a plain dict / list, served as JSON. Every request is recorded as
+    {'path', 'headers'} in `requests`.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append({'path': self.path, 'headers': dict(self.headers)})
+                route = stub.routes.get(self.path)
+                if route is None:
+                    status, headers, body = 404, {}, b'{}'
+                elif callable(route):
+                    status, headers, body = route(self)
+                else:
+                    status, headers, body = 200, {}, route
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except ConnectionError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def count(self, path):
+        return sum(1 for r in self.requests if r['path'] == path)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def closed_port_url():
+    """
+    A URL nothing listens on (connections are refused at once).
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BaseHTTPRequestHandler)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.server_close()
+    return url
+
+
+def wait_for(condition, timeout=5.0):
+    """
+    Polls `condition` until it is true; returns its last value.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def fpl_team(name, attack=1200, defence=1150, overall=1180):
+    """
+    One entry of the bootstrap-static 'teams' array.
+    """
+    return {
+        'name': name,
+        'strength': 4,
+        'strength_attack_home': attack,
+        'strength_attack_away': attack - 20,
+        'strength_defence_home': defence,
+        'strength_defence_away': defence - 20,
+        'strength_overall_home': overall,
+        'strength_overall_away': overall - 20,
+    }
+
+
+@pytest.fixture
+def trained_model(tmp_path, monkeypatch):
+    """
+    Trains a basic, temperature-calibrated model on two synthetic seasons in tmp_path, which
+    becomes the working directory (artifact paths are relative). Returns tmp_path.
+    """
+    import train_model
+    from benchmark import synthetic_season
+
+    monkeypatch.chdir(tmp_path)
+    synthetic_season(seed=0).to_csv('season23.csv', index=False)
+    synthetic_season(start='2024-08-10', seed=1).to_csv('season24.csv', index=False)
+    train_model.train(['season23.csv', 'season24.csv'], workers=1, cache_dir=None, n_jobs=1)
+    return tmp_path
@@ -0,0 +1,75 @@
+"""
+Calibrator persistence, and predictions following the calibrator that is on disk.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+import calibration
+import train_model
+from benchmark import synthetic_season
+from calibration import CALIBRATION_PATH, Calibrator
+from predictor import MatchPredictor
+from scenarios import scenario_grid
+
+MATCH = {'id': 1, 'home_team': 'Team 00', 'away_team': 'Team 01', 'avg_odds_home': 2.2,
+         'avg_odds_draw': 3.4, 'avg_odds_away': 3.1,
+         'last_5_matches_home': ['W', 'D'], 'last_5_matches_away': ['L']}
+
+
+def noisy_probs(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    probs = rng.dirichlet([2, 1, 2], n)
+    y = np.array([rng.choice(3, p=p) for p in probs])
+    # Over-confident version of the true probabilities
+    sharp = probs ** 2
+    return sharp / sharp.sum(axis=1, keepdims=True), y
+
+
+@pytest.mark.parametrize('method', calibration.METHODS)
+def test_calibrator_round_trips_through_json(method):
+    probs, y = noisy_probs()
+    fitted = calibration.fit(probs, y, method)
+
+    loaded = Calibrator.from_dict(json.loads(json.dumps(fitted.to_dict())))
+
+    assert loaded.method == method
+    np.testing.assert_array_equal(loaded.transform(probs), fitted.transform(probs))
+    np.testing.assert_allclose(loaded.transform(probs).sum(axis=1), 1.0)
+
+
+def write_calibrator(calibrator):
+    with open(CALIBRATION_PATH, 'w', encoding='utf-8') as f:
+        json.dump(calibrator.to_dict(), f)
+
+
+def test_serving_version_follows_the_calibrator(trained_model):
+    predictor = MatchPredictor()
+    assert predictor.calibrator is not None
+    version = predictor.serving_version
+    grid = scenario_grid(predictor, MATCH)
+
+    write_calibrator(Calibrator('temperature', temperature=predictor.calibrator.temperature * 2))
+    predictor.reload_if_changed()
+    assert predictor.serving_version != version
+    recalibrated = scenario_grid(predictor, MATCH)
+    assert recalibrated is not grid
+    assert not np.array_equal(recalibrated.probs, grid.probs)
+
+    os.remove(CALIBRATION_PATH)
+    predictor.reload_if_changed()
+    assert predictor.calibrator is None
+    assert predictor.serving_version not in (version, None)
+    assert scenario_grid(predictor, MATCH) is not recalibrated
+
+
+def test_incremental_update_removes_the_stale_calibrator(trained_model):
+    synthetic_season(start='2025-08-16', seed=2).head(40).to_csv('season25.csv', index=False)
+
+    train_model.update(['season23.csv', 'season24.csv', 'season25.csv'], workers=1, cache_dir=None,
+                       new_trees=5, n_jobs=1)
+
+    assert not os.path.exists(CALIBRATION_PATH)
+    assert MatchPredictor().calibrator is None
@@ -0,0 +1,140 @@
+"""
+Enrichment providers against a local stand-in for the odds / injuries / FPL sources.
+"""
+import time
+
+import pytest
+
+import data_loader
+import enrichment
+from conftest import fpl_team, wait_for
+from data_loader import FPLStrengthCache
+from enrichment import FPLStrengthProvider, HTTPFieldsProvider, Provider, enrich
+from fixture_store import FixtureStore
+
+ODDS_FIELDS = ('avg_odds_home', 'avg_odds_draw', 'avg_odds_away')
+
+
+def make_fixtures():
+    return FixtureStore([
+        {'id': 1, 'home_team': 'Arsenal', 'away_team': 'Chelsea', 'avg_odds_home': 2.1,
+         'home_injuries': ['Old (Knee)']},
+        {'id': 2, 'home_team': 'Wrexham', 'away_team': 'Liverpool', 'home_strength_attack': 1111},
+    ])
+
+
+def test_provider_is_abstract():
+    with pytest.raises(TypeError):
+        Provider()
+
+
+def test_fields_by_fixture_id(stub_server):
+    stub_server.routes['/odds'] = {'1': {'avg_odds_home': 1.9, 'avg_odds_draw': 3.5, 'avg_odds_away': 4.2}}
+    fixtures = make_fixtures()
+
+    report = enrich(fixtures, [HTTPFieldsProvider('odds', stub_server.url + '/odds', ODDS_FIELDS)], deadline=5)
+
+    assert report['odds']['ok']
+    assert fixtures[0]['avg_odds_home'] == 1.9
+    # Fixtures missing from the source keep the file's values (here: none)
+    assert 'avg_odds_home' not in fixtures[1]
+
+
+def test_fields_by_team(stub_server):
+    stub_server.routes['/injuries'] = {'Chelsea': {'injuries': ['James (Hamstring)']}}
+    fixtures = make_fixtures()
+
+    enrich(fixtures, [HTTPFieldsProvider('injuries', stub_server.url + '/injuries', ('injuries',), key='team')])
+
+    assert fixtures[0]['away_injuries'] == ['James (Hamstring)']
+    assert fixtures[0]['home_injuries'] == ['Old (Knee)']
+
+
+def test_transient_errors_are_retried(stub_server):
+    responses = iter([(500, {}, b'error'), (503, {}, b'busy')])
+    stub_server.routes['/odds'] = lambda request: next(responses, None) or (200, {}, {'2': {'avg_odds_draw': 3.3}})
+    fixtures = make_fixtures()
+
+    report = enrich(fixtures, [HTTPFieldsProvider('odds', stub_server.url + '/odds', ODDS_FIELDS, retries=2)])
+
+    assert report['odds']['ok']
+    assert stub_server.count('/odds') == 3
+    assert fixtures[1]['avg_odds_draw'] == 3.3
+
+
+def test_failing_provider_is_reported_and_others_still_apply(stub_server, closed_port_url):
+    stub_server.routes['/weather'] = {'1': {'weather_condition': 'Rain'}}
+    fixtures = make_fixtures()
+    providers = [
+        HTTPFieldsProvider('odds', closed_port_url + '/odds', ODDS_FIELDS, retries=0),
+        HTTPFieldsProvider('weather', stub_server.url + '/weather', ('weather_condition',)),
+    ]
+
+    report = enrich(fixtures, providers)
+
+    assert not report['odds']['ok'] and report['odds']['error']
+    assert report['weather']['ok']
+    assert fixtures[0]['avg_odds_home'] == 2.1
+    assert fixtures[0]['weather_condition'] == 'Rain'
+
+
+def test_deadline_keeps_the_sources_that_arrived(stub_server):
+    def slow(request):
+        time.sleep(1.0)
+        return 200, {}, {'1': {'avg_odds_home': 9.0}}
+    stub_server.routes['/odds'] = slow
+    stub_server.routes['/weather'] = {'1': {'weather_condition': 'Sunny'}}
+    fixtures = make_fixtures()
+    providers = [
+        HTTPFieldsProvider('odds', stub_server.url + '/odds', ODDS_FIELDS),
+        HTTPFieldsProvider('weather', stub_server.url + '/weather', ('weather_condition',)),
+    ]
+
+    started = time.monotonic()
+    report = enrich(fixtures, providers, deadline=0.3)
+
+    assert time.monotonic() - started < 0.8
+    assert 'timed out' in report['odds']['error']
+    assert fixtures[0]['avg_odds_home'] == 2.1
+    assert fixtures[0]['weather_condition'] == 'Sunny'
+
+
+def test_sources_are_cached_and_refreshed_in_the_background(stub_server):
+    stub_server.routes['/weather'] = {'1': {'weather_condition': 'Rain'}}
+    url = stub_server.url + '/weather'
+
+    enrich(make_fixtures(), [HTTPFieldsProvider('weather', url, ('weather_condition',))])
+    enrich(make_fixtures(), [HTTPFieldsProvider('weather', url, ('weather_condition',))])
+    assert stub_server.count('/weather') == 1
+
+    # Expired: the stale copy is applied at once and refetched behind the page
+    stub_server.routes['/weather'] = {'1': {'weather_condition': 'Snow'}}
+    fixtures = make_fixtures()
+    enrich(fixtures, [HTTPFieldsProvider('weather', url, ('weather_condition',), cache_ttl=0)])
+    assert fixtures[0]['weather_condition'] == 'Rain'
+    assert wait_for(lambda: stub_server.count('/weather') == 2)
+
+    assert wait_for(lambda: enrichment._json_cache[url]['data']['1']['weather_condition'] == 'Snow')
+    fixtures = make_fixtures()
+    enrich(fixtures, [HTTPFieldsProvider('weather', url, ('weather_condition',))])
+    assert fixtures[0]['weather_condition'] == 'Snow'
+    assert stub_server.count('/weather') == 2
+
+
+def test_fpl_only_fills_missing_strengths(stub_server, tmp_path, monkeypatch):
+    stub_server.routes['/api/bootstrap-static/'] = {'teams': [
+        fpl_team('Arsenal', attack=1300), fpl_team('Chelsea'), fpl_team('Liverpool', attack=1350)
+    ]}
+    cache = FPLStrengthCache(url=stub_server.url + '/api/bootstrap-static/', path=str(tmp_path / 'fpl.json'))
+    assert cache.refresh()
+    monkeypatch.setattr(data_loader, '_fpl_cache', cache)
+    fixtures = make_fixtures()
+
+    report = enrich(fixtures, [FPLStrengthProvider()])
+
+    assert report['fpl']['ok']
+    assert fixtures[0]['home_strength_attack'] == 1300
+    assert fixtures[1]['away_strength_attack'] == 1350 - 20
+    # The file's rating is kept; a team unknown to FPL stays empty
+    assert fixtures[1]['home_strength_attack'] == 1111
+    assert 'home_strength_defence' not in fixtures[1]
@@ -0,0 +1,53 @@
+"""
+Fixture files: CSV text is parsed into the same values as JSON, through to predict_matches.
+"""
+import csv
+
+from fixture_store import _is_missing, load_fixtures, parse_record
+from predictor import MatchPredictor
+
+FIELDS = ['id', 'home_team', 'away_team', 'avg_odds_home', 'avg_odds_draw', 'avg_odds_away',
+          'home_strength', 'away_strength', 'home_strength_attack', 'away_strength_defence',
+          'last_5_matches_home', 'last_5_matches_away']
+ROWS = [
+    ['1', 'Team 00', 'Team 01', '1.8', '3.6', '4.5', '4', '3', '1350', '1100', 'WWDWL', 'L,L,D,W,L'],
+    ['2', 'Team 02', 'Team 03', '', '', '', '', '2', '', '', '', 'WDW'],
+    ['3', 'Team 04', 'Team 05', '2.9', '3.2', '2.5', '3', '3', '1200.0', '1180', '["W", "D"]', 'LLL'],
+]
+
+
+def write_csv(path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(ROWS)
+    return path
+
+
+def test_csv_values_are_parsed(tmp_path):
+    store = load_fixtures(str(write_csv(tmp_path / 'fixtures.csv')))
+
+    first, second, third = store
+    assert first['home_strength_attack'] == 1350 and isinstance(first['home_strength_attack'], int)
+    assert first['home_strength'] == 4
+    assert first['avg_odds_home'] == 1.8
+    assert first['last_5_matches_away'] == ['L', 'L', 'D', 'W', 'L']
+    assert third['home_strength_attack'] == 1200
+    assert third['last_5_matches_home'] == ['W', 'D']
+    # Empty cells are missing, so .get() defaults and FPL enrichment apply
+    assert 'home_strength_attack' not in second and 'avg_odds_home' not in second
+    assert second.get('home_strength', 3) == 3
+    assert second['last_5_matches_home'] == []
+    assert _is_missing(store.column('home_strength_attack')[1])
+
+
+def test_csv_fixtures_predict_like_json(trained_model):
+    store = load_fixtures(str(write_csv(trained_model / 'fixtures.csv')))
+    records = [parse_record(dict(zip(FIELDS, row))) for row in ROWS]
+    predictor = MatchPredictor(cache_size=0)
+
+    # Fewer than 32 rows: explanations take the row-by-row path
+    from_csv = predictor.predict_matches(store, explain=True)
+    assert from_csv == predictor.predict_matches(records, explain=True)
+    assert from_csv == predictor.predict_matches(list(store), explain=True)
+    assert all(p['reasoning'] for p in from_csv)
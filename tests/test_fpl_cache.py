@@ -0,0 +1,107 @@
+"""
+FPLStrengthCache against a local stand-in for bootstrap-static.
+"""
+import json
+import time
+
+from conftest import fpl_team, wait_for
+from data_loader import FPLStrengthCache
+
+BOOTSTRAP = '/api/bootstrap-static/'
+
+
+def bootstrap_route(teams, etag='"v1"'):
+    """
+    bootstrap-static with ETag support: 304 when If-None-Match matches.
+    """
+    def route(request):
+        if request.headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, b''
+        # 'teams' comes before the large 'elements' array, as in the real payload
+        return 200, {'ETag': etag}, {'teams': teams, 'elements': [{'id': i} for i in range(1000)]}
+    return route
+
+
+def make_cache(url, tmp_path, **kwargs):
+    return FPLStrengthCache(url=url + BOOTSTRAP, path=str(tmp_path / 'fpl.json'), timeout=1, **kwargs)
+
+
+def test_cold_start_returns_immediately_and_fetches_in_background(stub_server, tmp_path):
+    stub_server.routes[BOOTSTRAP] = bootstrap_route([fpl_team('Arsenal')])
+    cache = make_cache(stub_server.url, tmp_path)
+
+    assert cache.get() is None
+    assert wait_for(lambda: cache.get() is not None)
+    assert cache.get()['Arsenal']['strength_attack_home'] == 1200
+    # Persisted for the next cold start
+    with open(tmp_path / 'fpl.json', encoding='utf-8') as f:
+        assert 'Arsenal' in json.load(f)['strength_map']
+
+
+def test_unreachable_api_never_blocks_and_backs_off(closed_port_url, tmp_path):
+    cache = make_cache(closed_port_url, tmp_path, retry_backoff=60)
+
+    started = time.monotonic()
+    for _ in range(20):
+        assert cache.get() is None
+    assert time.monotonic() - started < 0.5
+
+    wait_for(lambda: cache._failures == 1)
+    assert cache._failures == 1
+    thread = cache._refresh_thread
+    # Inside the backoff window no new refresh is started
+    for _ in range(20):
+        cache.get()
+    assert cache._refresh_thread is thread
+    assert cache._retry_at > time.time() + 50
+
+
+def test_backoff_doubles_up_to_the_max(closed_port_url, tmp_path):
+    cache = make_cache(closed_port_url, tmp_path, retries=0, retry_backoff=10, retry_backoff_max=30)
+    delays = []
+    for _ in range(4):
+        cache.refresh()
+        delays.append(round(cache._retry_at - time.time()))
+    assert delays == [10, 20, 30, 30]
+
+
+def test_transient_errors_are_retried_within_one_refresh(stub_server, tmp_path):
+    responses = iter([(503, {}, b'busy'), (500, {}, b'error')])
+    good = bootstrap_route([fpl_team('Arsenal')])
+    stub_server.routes[BOOTSTRAP] = lambda request: next(responses, None) or good(request)
+    cache = make_cache(stub_server.url, tmp_path, retries=2)
+
+    assert cache.refresh()
+    assert stub_server.count(BOOTSTRAP) == 3
+    assert cache._failures == 0
+
+
+def test_stale_copy_is_served_while_revalidating(stub_server, tmp_path):
+    stub_server.routes[BOOTSTRAP] = bootstrap_route([fpl_team('Arsenal')])
+    cache = make_cache(stub_server.url, tmp_path, ttl=0)
+    assert cache.refresh()
+    fetched_at = cache._fetched_at
+
+    # Stale (ttl=0): returned at once, revalidated with a conditional request answered by 304
+    assert cache.get()['Arsenal']['strength'] == 4
+    assert wait_for(lambda: cache._fetched_at > fetched_at)
+    assert stub_server.requests[-1]['headers'].get('If-None-Match') == '"v1"'
+    assert cache.get()['Arsenal']['strength'] == 4
+
+
+def test_failed_refresh_keeps_last_good_copy(stub_server, tmp_path):
+    stub_server.routes[BOOTSTRAP] = bootstrap_route([fpl_team('Arsenal')])
+    cache = make_cache(stub_server.url, tmp_path, ttl=0)
+    assert cache.refresh()
+
+    stub_server.routes[BOOTSTRAP] = lambda request: (500, {}, b'error')
+    assert not cache.refresh()
+    assert cache.get()['Arsenal']['strength_defence_home'] == 1150
+
+
+def test_disk_copy_serves_a_cold_start_without_network(stub_server, closed_port_url, tmp_path):
+    stub_server.routes[BOOTSTRAP] = bootstrap_route([fpl_team('Chelsea', attack=1300)])
+    assert make_cache(stub_server.url, tmp_path).refresh()
+
+    offline = make_cache(closed_port_url, tmp_path)
+    assert offline.get()['Chelsea']['strength_attack_home'] == 1300
@@ -0,0 +1,49 @@
+"""
+Crest prefetch against a local stand-in for the logo host.
+"""
+import io
+import json
+
+from PIL import Image
+
+import logo_cache
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="400" height="400"><circle r="200"/></svg>'
+
+
+def png(size):
+    out = io.BytesIO()
+    Image.new("RGBA", (size, size), (200, 0, 0, 255)).save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_prefetch_downscales_png_and_stores_svg_unchanged(stub_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stub_server.routes['/arsenal.png'] = lambda request: (200, {'Content-Type': 'image/png'}, png(400))
+    stub_server.routes['/chelsea.svg'] = lambda request: (200, {'Content-Type': 'image/svg+xml'}, SVG)
+    # SVG without the extension, recognized by its Content-Type
+    stub_server.routes['/crest?team=spurs'] = lambda request: (200, {'Content-Type': 'image/svg+xml'}, SVG)
+    urls = [stub_server.url + path for path in ('/arsenal.png', '/chelsea.svg', '/crest?team=spurs')]
+
+    assert logo_cache.prefetch(urls) == 3
+
+    with open(logo_cache.CREST_INDEX_PATH, encoding="utf-8") as f:
+        index = json.load(f)
+    store = tmp_path / logo_cache.CREST_STORE_DIR
+    with Image.open(store / index[urls[0]]) as img:
+        assert max(img.size) == logo_cache.LOGO_SIZE
+    assert index[urls[1]].endswith(".svg") and (store / index[urls[1]]).read_bytes() == SVG
+    assert index[urls[2]].endswith(".svg")
+    assert logo_cache.logo_src(urls[1]).startswith("data:image/svg+xml;base64,")
+
+    # Already stored: nothing is downloaded again
+    requests_before = len(stub_server.requests)
+    assert logo_cache.prefetch(urls) == 0
+    assert len(stub_server.requests) == requests_before
+
+
+def test_failed_downloads_are_skipped(stub_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stub_server.routes['/ok.svg'] = lambda request: (200, {'Content-Type': 'image/svg+xml'}, SVG)
+
+    assert logo_cache.prefetch([stub_server.url + '/missing.png', stub_server.url + '/ok.svg']) == 1
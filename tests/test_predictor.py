@@ -0,0 +1,17 @@
+"""
+Team name lookups on a trained predictor.
+"""
+import predictor
+from predictor import MatchPredictor
+
+
+def test_fuzzy_cache_is_bounded(trained_model, monkeypatch):
+    monkeypatch.setattr(predictor, 'FUZZY_CACHE_SIZE', 3)
+    p = MatchPredictor()
+
+    assert p.get_team_code('team 00') == p.get_team_code('Team 00')
+    for i in range(10):
+        assert p.get_team_code(f'Unknown FC {i}') is None
+
+    assert len(p._fuzzy_cache) == 3
+    assert list(p._fuzzy_cache) == ['Unknown FC 7', 'Unknown FC 8', 'Unknown FC 9']
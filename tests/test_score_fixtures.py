@@ -0,0 +1,28 @@
+"""
+Batch scoring of CSV input with strength columns, in chunks small enough for row-wise explanations.
+"""
+import io
+import json
+
+from score_fixtures import read_fixtures, score
+
+CSV = (
+    "HomeTeam,AwayTeam,AvgH,AvgD,AvgA,home_strength_attack,away_strength_defence,last_5_matches_home\n"
+    "Team 00,Team 01,1.8,3.6,4.5,1350,1100,W,W,D\n"
+    "Team 02,Team 03,,,,,,\n"
+)
+
+
+def test_read_fixtures_parses_like_fixture_files():
+    first, second = read_fixtures(io.StringIO(CSV.replace('W,W,D', 'WWD')), 'csv')
+    assert first['home_strength_attack'] == 1350 and first['avg_odds_home'] == 1.8
+    assert first['last_5_matches_home'] == ['W', 'W', 'D'] and first['last_5_matches_away'] == []
+    assert 'avg_odds_home' not in second and 'home_strength_attack' not in second
+
+
+def test_score_csv_with_strengths(trained_model):
+    out = io.StringIO()
+    assert score(io.StringIO(CSV.replace('W,W,D', '"W,W,D"')), out, 'csv', chunk_size=2) == 2
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r['home_team'] for r in results] == ['Team 00', 'Team 02']
+    assert all(r['reasoning'] for r in results)
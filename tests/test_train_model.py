@@ -0,0 +1,24 @@
+"""
+Incremental updates: which matches the new trees are fitted on.
+"""
+from sklearn.ensemble import RandomForestClassifier
+
+import train_model
+from benchmark import synthetic_season
+
+
+def test_update_window_reaches_into_the_previous_season(trained_model, monkeypatch):
+    synthetic_season(start='2025-08-16', seed=2).head(40).to_csv('season25.csv', index=False)
+    fitted = []
+    fit = RandomForestClassifier.fit
+
+    def recording_fit(self, X, y, *args, **kwargs):
+        fitted.append(len(X))
+        return fit(self, X, y, *args, **kwargs)
+    monkeypatch.setattr(RandomForestClassifier, 'fit', recording_fit)
+
+    train_model.update(['season23.csv', 'season24.csv', 'season25.csv'], workers=1, cache_dir=None,
+                       new_trees=5, window=100, n_jobs=1)
+
+    # The 40 new matches plus the last 100 of season 24
+    assert fitted == [140]
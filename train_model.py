@@ -1,93 +1,525 @@
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import numpy as np
 import pandas as pd
 import glob
 import pickle
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import KFold, cross_val_predict, train_test_split
 from sklearn.metrics import accuracy_score
 
-def train():
-    # 1. Load Data
-    csv_files = glob.glob("*.csv")
+import calibration
+from calibration import CALIBRATION_PATH
+from features import FEATURE_COLUMNS, FEATURE_STATE_PATH, compute_features, parse_dates
+from team_encoder import TeamEncoder
+
+# Columns read from the football-data CSVs (they ship 100+; everything else is skipped at parse time)
+INGEST_DTYPES = {
+    'HomeTeam': 'category',
+    'AwayTeam': 'category',
+    'FTR': 'category',
+    'AvgH': 'float32',
+    'AvgD': 'float32',
+    'AvgA': 'float32',
+    # Only used by the rich feature set (features.py)
+    'Date': 'str',
+    'FTHG': 'float32',
+    'FTAG': 'float32',
+}
+# Model input columns and target mapping (FTR: H=2, D=1, A=0)
+FEATURES = ['HomeTeam_Code', 'AwayTeam_Code', 'AvgH', 'AvgD', 'AvgA']
+FTR_MAP = {'H': 2, 'D': 1, 'A': 0}
+# Flattened forest for serving: a directory of .npy arrays (see export_compact)
+COMPACT_MODEL_PATH = 'football_model_arrays'
+# Rows already trained on per CSV, used by incremental updates
+TRAIN_STATE_PATH = 'train_state.json'
+# Folds for the out-of-fold predictions the probability calibrator is fitted on
+CALIBRATION_FOLDS = 5
+# Parsed seasons are cached here, keyed by the source file's content hash
+SEASON_CACHE_DIR = os.path.join('.cache', 'seasons')
+
+
+def _season_cache_path(path, cache_dir):
+    h = hashlib.sha1(repr(sorted(INGEST_DTYPES.items())).encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    # Parquet when pyarrow is available, pickle otherwise
+    ext = 'parquet' if importlib.util.find_spec('pyarrow') else 'pkl'
+    return os.path.join(cache_dir, f"{h.hexdigest()}.{ext}")
+
+
+def load_season(path, cache_dir=SEASON_CACHE_DIR):
+    """
+    Reads the columns in INGEST_DTYPES from one season CSV.
+    With a cache_dir, an unchanged file is loaded from its cached copy instead of being re-parsed.
+    """
+    cache_path = _season_cache_path(path, cache_dir) if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        if cache_path.endswith('.parquet'):
+            return pd.read_parquet(cache_path)
+        return pd.read_pickle(cache_path)
+
+    df = pd.read_csv(
+        path,
+        usecols=lambda col: col in INGEST_DTYPES,
+        dtype=INGEST_DTYPES
+    )
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        if cache_path.endswith('.parquet'):
+            df.to_parquet(tmp_path)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+    return df
+
+
+def load_seasons(csv_files, workers=None, cache_dir=SEASON_CACHE_DIR):
+    """
+    Loads several season CSVs in parallel (one process per file, up to `workers`).
+    Returns {path: DataFrame} in input order; unreadable files are reported and skipped.
+    """
+    if workers is None:
+        workers = min(len(csv_files), os.cpu_count() or 1)
+
+    dfs = {}
+    if workers <= 1 or len(csv_files) <= 1:
+        for f in csv_files:
+            try:
+                dfs[f] = load_season(f, cache_dir)
+            except Exception as e:
+                print(f"Error reading {f}: {e}")
+        return dfs
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(load_season, f, cache_dir) for f in csv_files]
+        for f, future in zip(csv_files, futures):
+            try:
+                dfs[f] = future.result()
+            except Exception as e:
+                print(f"Error reading {f}: {e}")
+    return dfs
+
+
+def _load_matches(csv_files, workers, cache_dir):
+    """
+    Loads the season CSVs into one frame.
+    Returns (full_df, file_rows) where file_rows maps each file name to its (start, stop) row range,
+    or (None, None) if nothing loaded.
+    """
+    if csv_files is None:
+        csv_files = glob.glob("*.csv")
     if not csv_files:
         print("No CSV files found!")
-        return
+        return None, None
 
     print(f"Loading files: {csv_files}")
-    dfs = []
-    for f in csv_files:
-        try:
-            df = pd.read_csv(f)
-            dfs.append(df)
-        except Exception as e:
-            print(f"Error reading {f}: {e}")
+    dfs = load_seasons(csv_files, workers=workers, cache_dir=cache_dir)
 
     if not dfs:
-        return
+        return None, None
 
-    full_df = pd.concat(dfs, ignore_index=True)
-    
-    # 2. Data Cleaning
+    # Remember where each file's rows sit, so an incremental update can find the new ones
+    file_rows = {}
+    start = 0
+    for f, df in dfs.items():
+        file_rows[os.path.basename(f)] = (start, start + len(df))
+        start += len(df)
+
+    full_df = pd.concat(dfs.values(), ignore_index=True)
+    return full_df, file_rows
+
+
+def _clean_matches(full_df):
+    """
+    Keeps the model columns and drops incomplete rows. Returns None if columns are missing.
+    """
     # Keep relevant columns
     cols_to_keep = ['HomeTeam', 'AwayTeam', 'FTR', 'AvgH', 'AvgD', 'AvgA']
     # Check if columns exist
     if not all(col in full_df.columns for col in cols_to_keep):
         print(f"Dataset missing required columns. Available: {full_df.columns}")
-        return
+        return None
 
-    df_clean = full_df[cols_to_keep].dropna()
+    return full_df[cols_to_keep].dropna()
 
-    # 3. Preprocessing
-    le = LabelEncoder()
-    # Fit encoder on all unique team names (both home and away)
-    all_teams = pd.concat([df_clean['HomeTeam'], df_clean['AwayTeam']]).unique()
-    le.fit(all_teams)
 
-    df_clean['HomeTeam_Code'] = le.transform(df_clean['HomeTeam'])
-    df_clean['AwayTeam_Code'] = le.transform(df_clean['AwayTeam'])
+def _encode_matches(df_clean, encoder, match_features=None):
+    """
+    Adds team codes and the Result target. Returns (X, y).
+    match_features: optional FEATURE_COLUMNS array aligned with the full frame's rows (rich feature set).
+    """
+    df_clean = df_clean.copy()
+    df_clean['HomeTeam_Code'] = encoder.transform(df_clean['HomeTeam'])
+    df_clean['AwayTeam_Code'] = encoder.transform(df_clean['AwayTeam'])
+    features = FEATURES
+    if match_features is not None:
+        df_clean[FEATURE_COLUMNS] = match_features[df_clean.index.to_numpy()]
+        features = FEATURES + FEATURE_COLUMNS
 
-    # Map FTR: H=2, D=1, A=0
-    ftr_map = {'H': 2, 'D': 1, 'A': 0}
     # Filter rows with unexpected FTR
-    df_clean = df_clean[df_clean['FTR'].isin(ftr_map.keys())]
-    df_clean['Result'] = df_clean['FTR'].map(ftr_map)
+    df_clean = df_clean[df_clean['FTR'].isin(FTR_MAP.keys())]
+    df_clean['Result'] = df_clean['FTR'].map(FTR_MAP)
 
-    # 4. Training
-    # We use Team Codes AND Market Odds
-    # Market odds are incredibly strong predictors (Wisdom of the Crowd)
-    features = ['HomeTeam_Code', 'AwayTeam_Code', 'AvgH', 'AvgD', 'AvgA']
-    
     # Drop rows where odds are missing
     df_clean = df_clean.dropna(subset=features)
 
-    X = df_clean[features]
-    y = df_clean['Result']
+    return df_clean[features], df_clean['Result']
 
-    # Split for validation mainly to print accuracy
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-    rf = RandomForestClassifier(n_estimators=100, random_state=42)
-    rf.fit(X_train, y_train)
+def _match_features(full_df, file_rows, store=None):
+    """
+    Rich features for every row of full_df, one chronological pass.
+    With a previous `store` ({'state', 'rows'}), rows already computed are reused and only
+    rows appended since then are processed (continuing from the saved state).
+    Returns (features aligned with full_df, new store), or (None, None) if columns are missing.
+    """
+    required = ['HomeTeam', 'AwayTeam', 'Date', 'FTHG', 'FTAG']
+    if not all(col in full_df.columns for col in required):
+        print(f"Rich features need columns {required}. Available: {list(full_df.columns)}")
+        return None, None
 
-    # 5. Evaluation
-    preds = rf.predict(X_test)
-    acc = accuracy_score(y_test, preds)
-    print(f"Model Training Complete. Accuracy: {acc:.4f}")
+    if store is None:
+        features, state = compute_features(full_df[required])
+        rows = {name: features[start:stop] for name, (start, stop) in file_rows.items()}
+        return features, {'state': state, 'rows': rows}
 
-    # Retrain on full dataset for production? 
-    # Usually better to use the one we validated or retrain exactly same params on full data.
-    # Let's retrain on full data for maximum knowledge
-    rf_full = RandomForestClassifier(n_estimators=100, random_state=42)
-    rf_full.fit(X, y)
+    state = store['state']
+    new_positions = np.concatenate([
+        np.arange(start + len(store['rows'].get(name, ())), stop)
+        for name, (start, stop) in file_rows.items()
+    ]).astype(np.intp)
+    new_features, state = compute_features(full_df.iloc[new_positions][required], state)
 
-    # 6. Saving
+    features = np.empty((len(full_df), len(FEATURE_COLUMNS)), dtype=np.float32)
+    features[new_positions] = new_features
+    rows = {}
+    for name, (start, stop) in file_rows.items():
+        cached = store['rows'].get(name, np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float32))
+        features[start:start + len(cached)] = cached
+        rows[name] = features[start:stop]
+    return features, {'state': state, 'rows': rows}
+
+
+def export_compact(model, encoder, path=COMPACT_MODEL_PATH):
+    """
+    Flattens every tree of the forest into a few contiguous arrays that predictor.CompactForest
+    evaluates with plain NumPy, without importing scikit-learn. Each array is saved as its own
+    .npy file in the `path` directory, so the predictor can memory-map it.
+
+    Node arrays are concatenated across trees with child indices made global. Leaves point
+    to themselves so a fixed number of traversal steps is always safe. Thresholds are
+    rounded down to float32; because inputs are compared as float32 (as in sklearn), this
+    gives exactly the same splits.
+    """
+    trees = [est.tree_ for est in model.estimators_]
+    sizes = np.array([t.node_count for t in trees])
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    feature = []
+    threshold = []
+    left = []
+    right = []
+    value = []
+    for root, t in zip(roots, trees):
+        node_ids = np.arange(t.node_count) + root
+        is_leaf = t.children_left == -1
+        feature.append(np.where(is_leaf, 0, t.feature))
+        threshold.append(np.where(is_leaf, 0.0, t.threshold))
+        left.append(np.where(is_leaf, node_ids, t.children_left + root))
+        right.append(np.where(is_leaf, node_ids, t.children_right + root))
+        # Per-node class distribution, normalised to the probabilities the tree would return
+        counts = t.value[:, 0, :]
+        value.append(counts / counts.sum(axis=1, keepdims=True))
+
+    threshold = np.concatenate(threshold)
+    threshold32 = threshold.astype(np.float32)
+    rounded_up = threshold32 > threshold
+    threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+
+    arrays = dict(
+        feature=np.concatenate(feature).astype(np.int32),
+        threshold=threshold32,
+        children_left=np.concatenate(left).astype(np.int32),
+        children_right=np.concatenate(right).astype(np.int32),
+        value=np.concatenate(value).astype(np.float32),
+        roots=roots.astype(np.int32),
+        max_depth=np.array(max(t.max_depth for t in trees), dtype=np.int32),
+        classes=np.asarray(model.classes_, dtype=np.int64),
+        features=np.array([str(name) for name in model.feature_names_in_]),
+        teams=np.array([str(name) for name in encoder.classes_])
+    )
+
+    # Written next to the live directory and swapped in, so readers see the old or the new model.
+    # Processes still mapping the old files keep reading them until they reload.
+    tmp_path = f"{path}.tmp"
+    old_path = f"{path}.old"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    if os.path.exists(path):
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def _save_artifacts(model, encoder, file_rows, feature_store=None):
     with open('football_model.pkl', 'wb') as f:
-        pickle.dump(rf_full, f)
-    
+        pickle.dump(model, f)
+    # Flattened, memory-mappable copy for sklearn-free serving
+    export_compact(model, encoder)
+
     with open('encoder.pkl', 'wb') as f:
-        pickle.dump(le, f)
+        pickle.dump(encoder, f)
+
+    with open(TRAIN_STATE_PATH, 'w', encoding='utf-8') as f:
+        rows_per_file = {name: stop - start for name, (start, stop) in file_rows.items()}
+        json.dump({'rows_per_file': rows_per_file}, f, indent=2)
+
+    if feature_store is not None:
+        with open(FEATURE_STATE_PATH, 'wb') as f:
+            pickle.dump(feature_store, f)
 
     print("Model and Encoder saved successfully.")
 
+
+def _calibrate(X, y, method, n_jobs=-1):
+    """
+    Fits a calibrator on out-of-fold predictions (CALIBRATION_FOLDS forests with the production
+    settings, each scoring the matches it was not fitted on), prints its metrics and saves it
+    to CALIBRATION_PATH.
+    """
+    folds = KFold(n_splits=CALIBRATION_FOLDS, shuffle=True, random_state=42)
+    rf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    oof = cross_val_predict(rf, X, y, cv=folds, method='predict_proba')
+    calibrator, metrics = calibration.fit_and_report(
+        oof, y.to_numpy(), method, odds=X[['AvgH', 'AvgD', 'AvgA']].to_numpy()
+    )
+    # Written to a temporary file and swapped in, so a hot reload never reads a partial file
+    tmp_path = f"{CALIBRATION_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({**calibrator.to_dict(), 'metrics': metrics}, f, indent=2)
+    os.replace(tmp_path, CALIBRATION_PATH)
+
+    detail = f"T={calibrator.temperature:.3f}" if method == 'temperature' else "isotonic"
+    print(f"Calibration ({detail}) fitted on {metrics['matches']} out-of-fold predictions:")
+    for name in ('raw', 'calibrated', 'market'):
+        m = metrics[name]
+        print(f"  {name:<11} log loss {m['log_loss']:.4f}  Brier {m['brier']:.4f}  ECE {m['ece']:.4f}")
+
+
+def train(csv_files=None, workers=None, cache_dir=SEASON_CACHE_DIR, validation='holdout', n_jobs=-1,
+          feature_set='basic', calibration_method='temperature'):
+    """
+    Full retrain on every season CSV.
+    validation='holdout' scores a separate 80/20 fit, then refits on all data (original behaviour).
+    validation='oob' fits once on all data and reports the out-of-bag accuracy of that same forest.
+    Trees are built on n_jobs cores (-1: all); the fitted model does not depend on n_jobs.
+    feature_set='rich' adds the features.py columns (form, goal difference, rest days, Elo).
+    calibration_method ('temperature', 'isotonic' or None) fits the probability calibrator
+    applied at serve time (see calibration.py).
+    """
+    # 1. Load Data
+    full_df, file_rows = _load_matches(csv_files, workers, cache_dir)
+    if full_df is None:
+        return
+
+    # 2. Data Cleaning
+    df_clean = _clean_matches(full_df)
+    if df_clean is None:
+        return
+
+    # 3. Preprocessing
+    # Fit encoder on all unique team names (both home and away)
+    # TeamEncoder numbers them like LabelEncoder but keeps codes stable across incremental updates
+    le = TeamEncoder()
+    all_teams = pd.concat([df_clean['HomeTeam'], df_clean['AwayTeam']]).unique()
+    le.fit(all_teams)
+
+    # 4. Training
+    # We use Team Codes AND Market Odds
+    # Market odds are incredibly strong predictors (Wisdom of the Crowd)
+    match_features, feature_store = None, None
+    if feature_set == 'rich':
+        match_features, feature_store = _match_features(full_df, file_rows)
+        if match_features is None:
+            return
+    X, y = _encode_matches(df_clean, le, match_features)
+
+    if validation == 'oob':
+        # One fit: the out-of-bag samples of each tree act as the validation set
+        rf_full = RandomForestClassifier(n_estimators=100, random_state=42, oob_score=True, n_jobs=n_jobs)
+        rf_full.fit(X, y)
+        print(f"Model Training Complete. OOB Accuracy: {rf_full.oob_score_:.4f}")
+    else:
+        # Split for validation mainly to print accuracy
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        rf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+        rf.fit(X_train, y_train)
+
+        # 5. Evaluation
+        preds = rf.predict(X_test)
+        acc = accuracy_score(y_test, preds)
+        print(f"Model Training Complete. Accuracy: {acc:.4f}")
+
+        # Retrain on full dataset for production? 
+        # Usually better to use the one we validated or retrain exactly same params on full data.
+        # Let's retrain on full data for maximum knowledge
+        rf_full = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+        rf_full.fit(X, y)
+
+    # 6. Saving
+    # Serve single-threaded: one-row predictions are slower with a joblib pool
+    rf_full.set_params(n_jobs=None)
+    # Calibration is written (or removed) before the model, so a running predictor never
+    # serves the new model with the previous model's calibrator
+    if calibration_method:
+        _calibrate(X, y, calibration_method, n_jobs)
+    elif os.path.exists(CALIBRATION_PATH):
+        os.remove(CALIBRATION_PATH)
+    _save_artifacts(rf_full, le, file_rows, feature_store)
+
+
+def update(csv_files=None, workers=None, cache_dir=SEASON_CACHE_DIR,
+           new_trees=20, window=380, max_trees=300, n_jobs=-1):
+    """
+    Incremental retrain: adds `new_trees` trees (warm_start) whenever the CSVs contain rows that
+    the saved model has not seen yet, fitted on those rows plus the `window` matches before them.
+    New teams are appended to the encoder, so existing team codes never change.
+    The oldest trees are dropped once the forest exceeds `max_trees`.
+    """
+    try:
+        with open('football_model.pkl', 'rb') as f:
+            rf = pickle.load(f)
+        with open('encoder.pkl', 'rb') as f:
+            le = pickle.load(f)
+        with open(TRAIN_STATE_PATH, 'r', encoding='utf-8') as f:
+            rows_seen = json.load(f)['rows_per_file']
+    except FileNotFoundError:
+        print("No previous model / training state found. Running a full train instead.")
+        return train(csv_files, workers, cache_dir, n_jobs=n_jobs)
+
+    if not isinstance(le, TeamEncoder):
+        le = TeamEncoder.from_label_encoder(le)
+
+    full_df, file_rows = _load_matches(csv_files, workers, cache_dir)
+    if full_df is None:
+        return
+
+    # Rows appended to each file since the last run
+    new_rows = 0
+    appended = []
+    for name, (start, stop) in file_rows.items():
+        seen = rows_seen.get(name, 0)
+        if stop - start < seen:
+            print(f"{name} lost rows since the last run. Run a full train instead.")
+            return
+        if stop - start > seen:
+            new_rows += stop - start - seen
+            appended.extend(range(start + seen, stop))
+    if new_rows == 0:
+        print("No new matches since the last training run.")
+        return
+
+    df_clean = _clean_matches(full_df)
+    if df_clean is None:
+        return
+
+    le.extend(pd.concat([df_clean['HomeTeam'], df_clean['AwayTeam']]).unique())
+
+    # Rich models: continue the feature state over the new rows only
+    match_features, feature_store = None, None
+    if FEATURE_COLUMNS[0] in getattr(rf, 'feature_names_in_', ()):
+        try:
+            with open(FEATURE_STATE_PATH, 'rb') as f:
+                feature_store = pickle.load(f)
+        except FileNotFoundError:
+            print("Feature state missing. Run a full train with --features rich.")
+            return
+        match_features, feature_store = _match_features(full_df, file_rows, feature_store)
+        if match_features is None:
+            return
+    X, y = _encode_matches(df_clean, le, match_features)
+
+    # Fit the new trees on the new matches plus the `window` matches before the earliest of them,
+    # across file boundaries: matches in date order (file order without a Date column)
+    is_new = X.index.isin(appended)
+    order = np.arange(len(X))
+    if 'Date' in full_df.columns:
+        # Unparseable dates (NaT) sort last
+        order = np.argsort(parse_dates(full_df.loc[X.index, 'Date']).to_numpy(dtype='datetime64[ns]'), kind='stable')
+    first_new = is_new[order].argmax()
+    is_recent = is_new.copy()
+    is_recent[order[max(0, first_new - window):first_new]] = True
+    X_recent = X[is_recent]
+    y_recent = y[is_recent]
+    if set(y_recent.unique()) != set(rf.classes_):
+        print("Recent window does not contain every outcome. Increase window or run a full train.")
+        return
+
+    rf.set_params(warm_start=True, n_estimators=len(rf.estimators_) + new_trees, n_jobs=n_jobs)
+    rf.fit(X_recent, y_recent)
+    if max_trees and len(rf.estimators_) > max_trees:
+        rf.estimators_ = rf.estimators_[-max_trees:]
+    rf.set_params(warm_start=False, n_estimators=len(rf.estimators_), n_jobs=None)
+    print(f"Model updated with {new_rows} new matches. Forest size: {len(rf.estimators_)} trees.")
+
+    # The calibrator was fitted for the previous forest (refitting it needs the out-of-fold predictions
+    # of a full train), so it is removed before the updated model is written
+    if os.path.exists(CALIBRATION_PATH):
+        os.remove(CALIBRATION_PATH)
+        print(f"Removed {CALIBRATION_PATH}: it was fitted for the previous forest. "
+              f"Run a full train to calibrate again.")
+    _save_artifacts(rf, le, file_rows, feature_store)
+
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Train the match outcome model on season CSVs.")
+    parser.add_argument('csv_files', nargs='*', help="Season CSVs (default: *.csv in the current directory)")
+    parser.add_argument('--workers', type=int, default=None, help="Parallel CSV readers (default: one per CPU)")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-parse CSVs instead of using the season cache")
+    parser.add_argument('--validation', choices=['holdout', 'oob'], default='holdout',
+                        help="holdout: separate 80/20 fit (default); oob: single fit scored out-of-bag")
+    parser.add_argument('--features', choices=['basic', 'rich'], default='basic',
+                        help="basic: team codes + odds (default); rich: also form, goal difference, rest days, Elo")
+    parser.add_argument('--calibration', choices=['temperature', 'isotonic', 'none'], default='temperature',
+                        help="Probability calibration fitted on out-of-fold predictions (default: temperature)")
+    parser.add_argument('--jobs', type=int, default=-1, help="Cores used to build trees (default: all)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Add trees for matches appended since the last run instead of a full retrain")
+    parser.add_argument('--new-trees', type=int, default=20, help="Trees added per incremental update")
+    parser.add_argument('--window', type=int, default=380, help="Recent matches the new trees are fitted on")
+    parser.add_argument('--max-trees', type=int, default=300, help="Forest size cap for incremental updates")
+    args = parser.parse_args()
+
+    cache_dir = None if args.no_cache else SEASON_CACHE_DIR
+    if args.incremental:
+        update(
+            csv_files=args.csv_files or None,
+            workers=args.workers,
+            cache_dir=cache_dir,
+            new_trees=args.new_trees,
+            window=args.window,
+            max_trees=args.max_trees,
+            n_jobs=args.jobs
+        )
+    else:
+        train(
+            csv_files=args.csv_files or None,
+            workers=args.workers,
+            cache_dir=cache_dir,
+            validation=args.validation,
+            n_jobs=args.jobs,
+            feature_set=args.features,
+            calibration_method=None if args.calibration == 'none' else args.calibration
+        )
@@ -0,0 +1,119 @@
+import argparse
+import glob
+import itertools
+import json
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, log_loss
+
+import shared_matrix
+from team_encoder import TeamEncoder
+from train_model import SEASON_CACHE_DIR, _clean_matches, _encode_matches, _load_matches
+
+# Search space for the forest
+PARAM_GRID = {
+    'n_estimators': [100, 200, 400],
+    'max_depth': [None, 8, 12, 16],
+    'min_samples_leaf': [1, 5, 10, 20],
+}
+# JSON rather than CSV so train_model's *.csv glob never picks it up
+LEADERBOARD_PATH = 'tuning_leaderboard.json'
+
+def time_series_folds(n_rows, n_folds):
+    """
+    Expanding-window folds over chronologically ordered rows: train on [0, start), test on [start, stop).
+    Returned as slice bounds so workers take views of the shared matrix instead of copies.
+    """
+    fold_size = n_rows // (n_folds + 1)
+    return [(k * fold_size, (k + 1) * fold_size if k < n_folds else n_rows)
+            for k in range(1, n_folds + 1)]
+
+
+def _evaluate(params, folds):
+    """
+    Cross-validates one parameter set on the shared matrix (single-threaded; the pool provides parallelism).
+    """
+    accuracies = []
+    losses = []
+    started = time.perf_counter()
+    X, y = shared_matrix.X, shared_matrix.y
+    for start, stop in folds:
+        rf = RandomForestClassifier(random_state=42, n_jobs=1, **params)
+        rf.fit(X[:start], y[:start])
+        probs = rf.predict_proba(X[start:stop])
+        accuracies.append(accuracy_score(y[start:stop], rf.classes_[probs.argmax(axis=1)]))
+        losses.append(log_loss(y[start:stop], probs, labels=rf.classes_))
+    return {
+        **params,
+        'accuracy': float(np.mean(accuracies)),
+        'log_loss': float(np.mean(losses)),
+        'fit_seconds': round(time.perf_counter() - started, 2)
+    }
+
+
+def tune(csv_files=None, n_folds=5, workers=None, cache_dir=SEASON_CACHE_DIR, output=LEADERBOARD_PATH):
+    """
+    Time-series cross-validated grid search over PARAM_GRID, one parameter set per worker process.
+    Matches are sorted by their parsed Date (as in backtest.py) before the folds are built, so
+    every fold trains on the past whatever the file names; without a Date column, file order is used.
+    Writes the leaderboard (best log loss first) to `output` and returns it as a list of dicts.
+    """
+    if csv_files is None:
+        csv_files = sorted(glob.glob("*.csv"))
+
+    full_df, _ = _load_matches(csv_files, workers=None, cache_dir=cache_dir)
+    if full_df is None:
+        return
+    df_clean = _clean_matches(full_df)
+    if df_clean is None:
+        return
+
+    le = TeamEncoder()
+    le.fit(pd.concat([df_clean['HomeTeam'], df_clean['AwayTeam']]).unique())
+    X, y = _encode_matches(df_clean, le)
+    if 'Date' in full_df.columns:
+        # Chronological order; matches with unparseable dates are dropped
+        X, y, _ = shared_matrix.date_order(X, y, full_df.loc[X.index, 'Date'])
+    else:
+        print("No Date column: folds follow file order.")
+
+    folds = time_series_folds(len(X), n_folds)
+    grid = [dict(zip(PARAM_GRID, values)) for values in itertools.product(*PARAM_GRID.values())]
+    print(f"Evaluating {len(grid)} parameter sets x {n_folds} folds on {len(X)} matches")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # One float32 copy on disk; every worker maps it read-only instead of receiving its own copy
+        shared_matrix.save(tmp, X, y)
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=shared_matrix.init_worker, initargs=(tmp,)) as pool:
+            results = list(pool.map(_evaluate, grid, itertools.repeat(folds)))
+
+    results.sort(key=lambda r: r['log_loss'])
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    best = results[0]
+    print(f"Best: {best} (leaderboard saved to {output})")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel time-series CV search over forest parameters.")
+    parser.add_argument('csv_files', nargs='*', help="Season CSVs (default: *.csv)")
+    parser.add_argument('--folds', type=int, default=5, help="Expanding-window folds")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--output', default=LEADERBOARD_PATH, help="Leaderboard JSON file")
+    args = parser.parse_args()
+
+    tune(
+        csv_files=args.csv_files or None,
+        n_folds=args.folds,
+        workers=args.workers,
+        output=args.output
+    )